@@ -1,6 +1,10 @@
+from fractions import Fraction
+
 import streamlit as st
 import yaml
 
+from arai.scoring import NORMALISATION_RATIO, scale_round_half_up, weighted_index
+
 # --- Page setup ---
 st.set_page_config(page_title="Aerodrome Risk Assessment", layout="wide")
 
@@ -370,7 +374,7 @@ with tab1:
     #total_ifr = total_ifr * 0.145
     #ifr_totals = [group * 0.145 for group in ifr_totals]
     # Multiply all IFR totals by 0.145 and round to nearest integer
-    num = 0.145455 #200/(vfr_totals["VFR"] + ifr_totals["IFR"])
+    num = NORMALISATION_RATIO #200/(vfr_totals["VFR"] + ifr_totals["IFR"])
     ifr_totals = {group: round(total) for group, total in ifr_totals.items()}
     vfr_totals = {group: round(total) for group, total in vfr_totals.items()}
     #result = {k: ((ifr_totals[k] *0.25) + (vfr_totals[k] * 0.75)) * num for k in ifr_totals}
@@ -382,12 +386,14 @@ with tab1:
     #f'key{i}': ((v1 * 0.25) + (v2 * 0.75))
     #    for i, (v1, v2) in enumerate(zip(ifr_totals.values(), vfr_totals.values()), 1)
     #}
-    from decimal import Decimal, ROUND_HALF_UP
-
-    result = {
-            new_key: int(Decimal(((v1 * ifr_ratio) + (v2 * vfr_ratio)) * num ).quantize(Decimal('1'), rounding=ROUND_HALF_UP))  #new_key: round(((v1 * 0.25) + (v2 * 0.75)))
-        for new_key, (v1, v2) in zip(new_keys, zip(ifr_totals.values(), vfr_totals.values()))
-    }
+    # Exact half-up rounding of the movement-weighted totals times num, all
+    # four aerodrome types in one pass (ratios and num as rationals, no
+    # float or Decimal in between)
+    paired_ifr, paired_vfr = list(ifr_totals.values()), list(vfr_totals.values())
+    result = dict(zip(new_keys, weighted_index(paired_ifr, paired_vfr, ifr_value, vfr_value, scale=num).tolist()))
+    # The same weighting without normalisation, keyed by IFR group, for the
+    # Weighted Score rows of the scoring table
+    weighted_raw = dict(zip(ifr_totals, weighted_index(paired_ifr, paired_vfr, ifr_value, vfr_value, scale=1).tolist()))
 
     # --- Optional: Weighted Aerodrome Index ---
     aero_data = result
@@ -536,9 +542,7 @@ with tab2:
             elif row == "VFR Score":
                 return vfr_totals.get("VFR", "")
             elif row == "Weighted Score":
-                i_val = ifr_totals.get("IFR", "")
-                v_val = vfr_totals.get("VFR", "")
-                return int(Decimal((i_val * ifr_ratio) + (v_val * vfr_ratio)).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+                return weighted_raw.get("IFR", "")
             else:
                 return ""
 
@@ -552,12 +556,7 @@ with tab2:
         elif row == "VFR Score":
             return vfr_totals.get(f"{prefix}-V", "")
         elif row == "Weighted Score":
-            i_val = ifr_totals.get(f"{prefix}-I")
-            v_val = vfr_totals.get(f"{prefix}-V")
-            if i_val is not None and v_val is not None:
-                return int(Decimal((i_val * ifr_ratio) + (v_val * vfr_ratio)).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
-            else:
-                return ""
+            return weighted_raw.get(f"{prefix}-I", "")
         else:
             return ""
 
@@ -575,14 +574,14 @@ with tab2:
 
     df = pd.DataFrame({"Raw": raw_vals}, index=rows)
 
-    # ---- Normalised column ----
-    def normalise(value):
-        try:
-            return int(Decimal(float(value) * 0.145).quantize(Decimal('1'), rounding=ROUND_HALF_UP)) #round(float(value) * 0.145, 2)
-        except (ValueError, TypeError):
-            return ""
+    # ---- Normalised column: every score x 0.145 in one pass ----
+    scored = [i for i, value in enumerate(raw_vals) if isinstance(value, int)]
+    normalised = [""] * len(raw_vals)
+    scaled = scale_round_half_up([raw_vals[i] for i in scored], Fraction("0.145"))  #round(float(value) * 0.145, 2)
+    for i, value in zip(scored, scaled.tolist()):
+        normalised[i] = value
 
-    df["Normalised"] = df["Raw"].apply(normalise)
+    df["Normalised"] = normalised
 
 
     # Streamlit display
@@ -1,7 +1,26 @@
+import functools
+import io
+
+import numpy as np
 import streamlit as st
 import yaml
 import streamlit.components.v1 as components
 
+import instrumentation
+from arai import table_cache
+from arai.export import (
+    XLSX_MIME, assessment_workbook, portfolio_template, portfolio_workbook, read_assessments
+)
+from arai.scoring import (
+    AERODROME_TYPES, FEEDBACK_GROUPS, IFR_GROUPS, VFR_GROUPS, ScoreTableError, score_batch
+)
+from arai.distribution import index_distribution
+from arai.mitigation import cost_template, mitigate, read_costs
+from arai.sweep import mix_sweep, movement_grid
+from arai.timeseries import MovementSeries, movement_template, read_movements, read_movements_xlsx
+from arai.uncertainty import CONFIDENCE, answer_probabilities, simulate
+from arai.whatif import sensitivity
+
 # --- Page setup ---
 st.set_page_config(page_title="Aerodrome Risk Assessment", layout="wide")
 
@@ -11,13 +30,6 @@ st.set_page_config(page_title="Aerodrome Risk Assessment", layout="wide")
 #Your total risk score and level will update dynamically.
 #""")
 
-import base64
-
-# Read local image and encode
-with open("MHA_Logo_PNG.png", "rb") as f:
-    img_bytes = f.read()
-encoded = base64.b64encode(img_bytes).decode()
-
 import streamlit as st
 
 # Hide Streamlit default menu, footer, and deploy banner
@@ -28,68 +40,18 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-hide_streamlit_style = """
-<style>
-/* Hide Streamlit footer and "Made with Streamlit" banner */
-footer {visibility: hidden;}
-header {visibility: hidden;}
-</style>
-"""
-st.markdown(hide_streamlit_style, unsafe_allow_html=True)
-
-
-st.markdown(f"""
-<style>
-/* Fixed top banner */
-.hero {{
-    position: fixed;
-    top: 0;
-    left: 0;
-    width: 100%;
-    height: 160px;  /* fixed height */
-    z-index: 9999;
-    display: flex;
-    align-items: center;
-    padding-left: clamp(16px, 4vw, 56px);
-    background-image:
-        linear-gradient(
-            to right,
-            rgba(245,246,248,1) 0%,
-            rgba(245,246,248,0.95) 40%,
-            rgba(245,246,248,0.6) 55%,
-            rgba(245,246,248,0.0) 70%
-        ),
-        url("data:image/png;base64,{encoded}");
-    background-size: auto 85%;
-    background-repeat: no-repeat;
-    background-position: right center;
-    box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-}}
-
-/* Ensure hero text flows normally */
-.hero-content {{
-    max-width: 60%;
-}}
-
-.hero h1 {{
-    margin: 0;
-    font-size: clamp(2rem, 3vw, 2.5rem);
-    font-weight: 800;
-    color: #111;
-}}
-
-.hero p {{
-    margin: 4px 0 0 0;
-    color: #333;
-    font-size: 1rem;
-}}
-
-/* Push main content down so it isn’t hidden behind hero */
-.main-content {{
-    padding-top: 30px;  /* same as hero height */
-}}
-</style>
+# --- Styles ---
+# All page CSS lives in static/app.css; the MHA logo is referenced from it by
+# URL (server.enableStaticServing) instead of being base64-inlined on every rerun.
+@st.cache_resource
+def load_css(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f"<style>\n{f.read()}</style>"
+
+st.markdown(load_css("static/app.css"), unsafe_allow_html=True)
 
+
+st.markdown("""
 <div class="hero">
     <div class="hero-content">
         <h1>Aerodrome Risk Assessment Indicator</h1>
@@ -107,12 +69,15 @@ st.markdown(f"""
 
 
 # Create multiple tabs
-tab1,tab2 = st.tabs(["Main Inputs", "Scores"])
+tab1,tab2,tab3 = st.tabs(["Main Inputs", "Scores", "Portfolio"])
 
 # Load YAML list
 with open("airports.yaml", "r") as f:
     airports = yaml.safe_load(f)  # airports is a Python list
 
+# Count reruns and server CPU per assessment (one assessment per airport)
+run_metrics = instrumentation.begin_run(st.session_state, st.session_state.get("airport", airports[0]))
+
 
 with tab1:
     #st.write("This is your main input tab.")
@@ -125,7 +90,7 @@ with tab1:
     #)
     
     # Dropdown
-    user_name = st.selectbox("Select Airport", airports)
+    user_name = st.selectbox("Select Airport", airports, key="airport")
 
     # 2️⃣ Two numeric inputs side by side
     col1, col2 = st.columns(2)
@@ -137,7 +102,8 @@ with tab1:
             value=10000,
             step=100,
             format="%d",
-            help="Numeric value used to calculate IFR proportion"
+            help="Numeric value used to calculate IFR proportion",
+            key="ifr_movements"
         )
 
     with col2:
@@ -147,398 +113,148 @@ with tab1:
             value=20000,
             step=100,
             format="%d",
-            help="Numeric value used to calculate VFR proportion"
+            help="Numeric value used to calculate VFR proportion",
+            key="vfr_movements"
         )
 
     # --- Radio buttons to choose ---
     selected = st.radio(
         "Select Aerodrome Type:",
         ['Unattended','ATC','AFIS','UNICOM/AWIB'],
-        horizontal=True
+        horizontal=True,
+        key="aerodrome_type"
     )
     st.markdown("""
     ## Complexity indicators (leading to pilot workload)				
     """)
 
-    # --- Custom CSS ---
-    st.markdown("""
-    <style>
-    [data-testid="stAppViewContainer"] {
-        background-color: #f4f6f8;
-        padding: 2rem;
-    }
-    .column-panel {
-        border: 1px solid #d1d5db;
-        padding: 1rem;
-        border-radius: 12px;
-        background-color: #ffffff;
-    }
-    h2 {
-        color: #1f77b4;
-    }
-    .stMetric {
-        background-color: #e9f7ef;
-        border-radius: 10px;
-        padding: 0.5rem;
-        margin-bottom: 1rem;
-    }
-    .stApp {
-        background-color: white;
-        color: black;
-    }
-    .css-1d391kg, .css-10trblm, .css-1d391kg span {
-        color: black !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-
-    # --- CSS for cell styling ---
-    st.markdown("""
-    <style>
-    .yellow-cell {
-        background-color: #ffff99;
-        font-weight: bold;
-        border: 1px solid black;
-        padding: 6px 12px;
-        text-align: center;
-        vertical-align: middle;
-    }
-
-    .blue-cell {
-        background-color: #b3e5fc;
-        border: 1px solid black;
-        padding: 0;
-        text-align: center;
-        vertical-align: middle;
-    }
-
-    .cell-container > div {
-        padding: 6px 12px;
-    }
-
-    /* Make text inputs fill their cell */
-    .css-1offfwp input[type="text"] {
-        background-color: #b3e5fc !important;
-        border: none !important;
-        text-align: center !important;
-        font-weight: bold !important;
-        font-size: 1rem !important;
-        padding: 6px !important;
-        width: 100% !important;
-        box-sizing: border-box !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-
-    # --- Load YAML data ---
-    @st.cache_data
-    def load_yaml(path):
-        with open(path, "r") as f:
-            return yaml.safe_load(f)
-
-    # IFR scores (numeric values for ATC-I)
-    SCORES_IFR = load_yaml("adjusted_ifr.yaml")
+    # --- Load scoring tables ---
+    # Compiled (group, question, answer) arrays used for all scoring below,
+    # read from the binary cache unless a YAML source has changed. The model
+    # is read-only, so one instance is shared by every session without copies.
+    @st.cache_resource
+    def get_model(ifr_path, vfr_path, labels_path):
+        return table_cache.load_model((ifr_path, vfr_path, labels_path))
+
+    # The tables are validated when they are compiled; a bad table stops the
+    # app here with the full list of problems instead of scoring with gaps.
+    try:
+        MODEL = get_model("adjusted_ifr.yaml", "adjusted_vfr.yaml", "scores.yaml")
+    except ScoreTableError as e:
+        st.error(f"The scoring tables could not be loaded.\n\n```\n{e}\n```")
+        st.stop()
 
     # Text labels mapping to numeric keys
-    SCORES_LABELS = load_yaml("scores.yaml")
-
-    SCORES_VFR = load_yaml("adjusted_vfr.yaml")
+    SCORES_LABELS = dict(zip(MODEL.questions, MODEL.answers))
 
     # --- Inputs ---
 
-    # --- CSS to style selectboxes in compact panels ---
-    st.markdown("""
-    <style>
-    .select-panel {
-        border: 1px solid #ccc;
-        background-color: #ffffff;
-        border-radius: 8px;
-        padding: 8px 12px;
-        margin-bottom: 15px;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.05);
-    }
-
-    /* Style category labels */
-    .select-panel strong {
-        color: #1f77b4;
-        font-size: 1rem;
-    }
-
-    /* Tighten spacing around selectboxes */
-    div[data-baseweb="select"] {
-        margin-top: 4px;
-        margin-bottom: 4px;
-    }
-
-    /* Make selectbox text smaller and compact */
-    span[data-baseweb="tag"] {
-        font-size: 0.9rem !important;
-    }
-
-    /* Adjust dropdown look */
-    div[data-baseweb="popover"] {
-        border-radius: 8px !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-
-    col1, spacer, col2 = st.columns([1, 0.1, 1])
-
-    answers = {}
     categories = list(SCORES_LABELS.keys())
     midpoint = len(categories) // 2
     left_cats = categories[:midpoint]
     right_cats = categories[midpoint:]
 
-    def get_percentage_str(question, selected_text):
-        numeric_key = SCORES_LABELS.get(question, {}).get(selected_text)
-        if numeric_key is not None:
-            value_dict = SCORES_IFR.get(question, {}).get(numeric_key)
-            if value_dict is not None:
-                percentage = value_dict.get("percentage", 0)
-                if percentage != 0:
-                    return f" ({percentage:+.0f}%)"
-        return ""
-
-    #with col1:
-    #    for category in left_cats:
-    #        st.markdown(f"<div class='select-panel'><strong>{category}</strong>", unsafe_allow_html=True)
-    #        answers[category] = st.selectbox("", list(SCORES_LABELS[category].keys()), key=category)
-    with col1:
-        for category in left_cats:
-            # 1️⃣ Markdown label at the top
-            st.markdown(f"**{category}**", unsafe_allow_html=True)
-
-            # 2️⃣ Compute feedback (colored_html) based on previous selection
-            prev_selection = st.session_state.get(category, None)
-            percentage_labels = []
-
-            if prev_selection:
-                numeric_key = SCORES_LABELS.get(category, {}).get(prev_selection)
-                groups = ["UNICOM-I", "AFIS-I", "ATC-I"]
-
-                for group in groups:
-                    group_questions = SCORES_IFR.get(group, {}).get(category, {})
-                    if numeric_key in group_questions:
-                        pct = group_questions[numeric_key]["percentage"]
-                        percentage_labels.append((group[:-2], pct))
-
-            if percentage_labels:
-                colored_html = " | ".join(
-                    f"<span style='color:{'red' if pct < 0 else 'green' if pct > 0 else 'black'};"
-                    f" font-weight:bold;'>{group}: {pct:+.0f}%</span>"
-                    for group, pct in percentage_labels
-                )
-                # 3️⃣ Show it *below the label, above the selectbox*
-                st.markdown(
-                    f"<div style='font-size:0.9rem; margin-bottom:4px;'> {colored_html}</div>",
-                    unsafe_allow_html=True
-                )
-
-            # 4️⃣ Then render the interactive selectbox
-            selected_answer = st.selectbox(
-                label=category,
-                options=list(SCORES_LABELS[category].keys()),
-                key=category,
-                label_visibility="collapsed"
-            )
+    def render_question(category, **widget_kwargs):
+        # 1️⃣ Markdown label at the top
+        st.markdown(f"**{category}**", unsafe_allow_html=True)
 
-            answers[category] = selected_answer
+        # 2️⃣ Compute feedback (colored_html) based on previous selection
+        prev_selection = st.session_state.get(category, None)
+        percentage_labels = []
 
+        if prev_selection:
+            for group in FEEDBACK_GROUPS:
+                pct = MODEL.percentage(group, category, prev_selection)
+                percentage_labels.append((group[:-2], pct))
 
-    #with col2:
-    #    for category in right_cats:
-    #        st.markdown(f"<div class='select-panel'><strong>{category}</strong>", unsafe_allow_html=True)
-    #        answers[category] = st.selectbox("", list(SCORES_LABELS[category].keys()), key=category)
+        if percentage_labels:
+            colored_html = " | ".join(
+                f"<span style='color:{'red' if pct < 0 else 'green' if pct > 0 else 'black'};"
+                f" font-weight:bold;'>{group}: {pct:+.0f}%</span>"
+                for group, pct in percentage_labels
+            )
+            # 3️⃣ Show it *below the label, above the selectbox*
+            st.markdown(
+                f"<div style='font-size:0.9rem; margin-bottom:4px;'> {colored_html}</div>",
+                unsafe_allow_html=True
+            )
 
+        # 4️⃣ Then render the interactive selectbox
+        return st.selectbox(
+            label=category,
+            options=list(SCORES_LABELS[category].keys()),
+            key=category,
+            label_visibility="collapsed",
+            **widget_kwargs
+        )
 
-    with col2:
-        for category in right_cats:
-            # 1️⃣ Markdown label at the top
-            st.markdown(f"**{category}**", unsafe_allow_html=True)
-
-            # 2️⃣ Compute feedback (colored_html) based on previous selection
-            prev_selection = st.session_state.get(category, None)
-            percentage_labels = []
-
-            if prev_selection:
-                numeric_key = SCORES_LABELS.get(category, {}).get(prev_selection)
-                groups = ["UNICOM-I", "AFIS-I", "ATC-I"]
-
-                for group in groups:
-                    group_questions = SCORES_IFR.get(group, {}).get(category, {})
-                    if numeric_key in group_questions:
-                        pct = group_questions[numeric_key]["percentage"]
-                        percentage_labels.append((group[:-2], pct))
-
-            if percentage_labels:
-                colored_html = " | ".join(
-                    f"<span style='color:{'red' if pct < 0 else 'green' if pct > 0 else 'black'};"
-                    f" font-weight:bold;'>{group}: {pct:+.0f}%</span>"
-                    for group, pct in percentage_labels
-                )
-                # 3️⃣ Show it *below the label, above the selectbox*
-                st.markdown(
-                    f"<div style='font-size:0.9rem; margin-bottom:4px;'> {colored_html}</div>",
-                    unsafe_allow_html=True
-                )
+    # --- Fragments ---
+    # In live mode each question is its own fragment. Changing an answer
+    # reruns only that question's panel plus the results, export and
+    # diagnostics fragments below, instead of the whole script. The
+    # analyses on the Scores tab are not rerun per answer: they are marked
+    # out of date and recomputed on request or on the next full run.
+    LIVE_FRAGMENTS = ["results", "export", "diagnostics", "analysis-status"]
+    ANALYSIS_FRAGMENTS = ["whatif", "contributions", "distribution", "mitigation", "uncertainty", "sweep", "timeseries"]
+
+    def on_answer_change(i):
+        instrumentation.start_interaction(st.session_state, f"answer: {categories[i]}")
+        st.session_state["analyses_stale"] = True
+        st.rerun([f"question-{i}"] + LIVE_FRAGMENTS)
+
+    def question_fragment(i, category):
+        @st.fragment(key=f"question-{i}")
+        def question_panel():
+            with instrumentation.fragment_run(st.session_state, f"question-{i}"):
+                render_question(category, on_change=on_answer_change, args=(i,))
+        return question_panel
+
+    # Live mode reruns the whole script after every answer; batch mode keeps
+    # the answers in a form and scores them once when it is submitted.
+    batch_mode = st.toggle(
+        "Batch entry",
+        key="batch_mode",
+        help="Collect all answers and score them once on submit instead of after every change"
+    )
+    questionnaire = st.form("questionnaire", border=False) if batch_mode else st.container()
 
-            # 4️⃣ Then render the interactive selectbox
-            selected_answer = st.selectbox(
-                label=category,
-                options=list(SCORES_LABELS[category].keys()),
-                key=category,
-                label_visibility="collapsed"
-            )
+    with questionnaire:
+        col1, spacer, col2 = st.columns([1, 0.1, 1])
 
-            answers[category] = selected_answer
-
-
-                #st.markdown("IFR: " + f", ".join(percentage_labels),unsafe_allow_html=True)
-
-    # --- Calculate total score ---
-    total_score = 0
-    for category, selected_text in answers.items():
-        numeric_key = SCORES_LABELS.get(category, {}).get(selected_text)
-        if numeric_key is not None:
-            total_score += numeric_key  # total "risk" score (based on label mapping)
-
-    groups = ["IFR", "UNICOM-I", "AFIS-I","ATC-I"]
-    ifr_totals = {}
-
-    #for group in groups:
-    #    total_ifr = 0.0
-    #    group_questions = SCORES_IFR.get(group, {})
-        
-    #    for question, selected_text in answers.items():
-    #        if question in group_questions:
-    #            numeric_key = SCORES_LABELS.get(question, {}).get(selected_text)
-    #            if numeric_key is not None:
-    #                total_ifr += float(group_questions[question].get(numeric_key, 0))
-    #    ifr_totals[group] = total_ifr
-    for group in groups:
-        total_ifr = 0.0
-        group_questions = SCORES_IFR.get(group, {})
-        
-        for question, selected_text in answers.items():
-            if question in group_questions:
-                # Map the answer text to numeric key
-                numeric_key = SCORES_LABELS.get(question, {}).get(selected_text)
-                if numeric_key is not None:
-                    # Grab the "value" from the YAML/dict structure
-                    value_dict = group_questions[question].get(numeric_key, {'value': 0, 'percentage': 0})
-                    value_dict = group_questions[question].get(numeric_key)  # this should be {'value': ..., 'percentage': ...}
-                    if isinstance(value_dict, dict):
-                        val = value_dict.get("value", 0)
-                        total_ifr += float(val)
-                    else:
-                        total_ifr += 0  # fallback if something went wrong
-                    #total_ifr += float(value_dict.get("value", 0))
-        
-        ifr_totals[group] = total_ifr
-
-        
-    groups = ["VFR", "UNICOM-V", "AFIS-V","ATC-V"]
-    vfr_totals = {}
-
-    # for group in groups:
-    #     total_vfr = 0.0
-    #     group_questions = SCORES_VFR.get(group, {})
-    #     for question, selected_text in answers.items():
-    #         if question in group_questions:
-    #             numeric_key = SCORES_LABELS.get(question, {}).get(selected_text)
-    #             if numeric_key is not None:
-    #                 total_vfr += float(group_questions[question].get(numeric_key, 0))
-    #     vfr_totals[group] = total_vfr
-
-    for group in groups:
-        total_vfr = 0.0
-        group_questions = SCORES_VFR.get(group, {})
-        
-        for question, selected_text in answers.items():
-            if question in group_questions:
-                # Map the answer text to numeric key
-                numeric_key = SCORES_LABELS.get(question, {}).get(selected_text)
-                if numeric_key is not None:
-                    # Grab the "value" from the YAML/dict structure
-                    value_dict = group_questions[question].get(numeric_key, {'value': 0, 'percentage': 0})
-                    value_dict = group_questions[question].get(numeric_key)  # this should be {'value': ..., 'percentage': ...}
-                    if isinstance(value_dict, dict):
-                        val = value_dict.get("value", 0)
-                        total_vfr += float(val)
+        for column, column_cats in ((col1, left_cats), (col2, right_cats)):
+            with column:
+                for category in column_cats:
+                    if batch_mode:
+                        render_question(category)
                     else:
-                        total_vfr += 0  # fallback if something went wrong
-                    #total_ifr += float(value_dict.get("value", 0))
-        
-        vfr_totals[group] = total_vfr
-
-    # --- Calculate proportional weights ---
-    total_value = ifr_value + vfr_value
-    ifr_ratio = ifr_value / total_value if total_value > 0 else 0.25
-    vfr_ratio = vfr_value / total_value if total_value > 0 else 0.75
-
-    #total_ifr = total_ifr * 0.145
-    #ifr_totals = [group * 0.145 for group in ifr_totals]
-    # Multiply all IFR totals by 0.145 and round to nearest integer
-    num = 0.145455 #200/(vfr_totals["VFR"] + ifr_totals["IFR"])
-    ifr_totals = {group: round(total) for group, total in ifr_totals.items()}
-    vfr_totals = {group: round(total) for group, total in vfr_totals.items()}
-    #result = {k: ((ifr_totals[k] *0.25) + (vfr_totals[k] * 0.75)) * num for k in ifr_totals}
-
-    new_keys = ['Unattended', 'ATC', 'AFIS','UNICOM/AWIB']
-
-
-    #result = {
-    #f'key{i}': ((v1 * 0.25) + (v2 * 0.75))
-    #    for i, (v1, v2) in enumerate(zip(ifr_totals.values(), vfr_totals.values()), 1)
-    #}
-    from decimal import Decimal, ROUND_HALF_UP
-
-    result = {
-            new_key: int(Decimal(((v1 * ifr_ratio) + (v2 * vfr_ratio)) * num ).quantize(Decimal('1'), rounding=ROUND_HALF_UP))  #new_key: round(((v1 * 0.25) + (v2 * 0.75)))
-        for new_key, (v1, v2) in zip(new_keys, zip(ifr_totals.values(), vfr_totals.values()))
-    }
-
-    # --- Optional: Weighted Aerodrome Index ---
-    aero_data = result
-
-    # --- Custom HTML Table (styled like your image) ---
-    highlight_color = "#d1e7dd"  # light green highlight
-    html_table = f"""
-<style>
-.custom-table {{
-    border-collapse: collapse;
-    width: 100%;
-    margin-top: 10px;
-    text-align: center;
-    font-family: Arial, sans-serif;
-}}
-.custom-table th {{
-    border: 2px solid black;
-    padding: 8px;
-    background-color: #f8f9fa;
-    font-weight: bold;
-    color: black;
-}}
-.custom-table td {{
-    border: 2px solid black;
-    padding: 10px;
-    font-size: 16px;
-    color: black;
-}}
-.index-col {{
-    font-weight: bold;
-    border: 2px solid black;
-    background-color: #f8f9fa;
-    text-align: left;
-    padding-left: 10px;
-}}
-.highlight {{
-    background-color: #d1e7dd;
-    font-weight: bold;
-}}
-</style>
+                        question_fragment(categories.index(category), category)()
+
+        if batch_mode:
+            st.form_submit_button("Score assessment", type="primary")
+
+    def current_scores():
+        """Score the answers and movements currently held in session state.
 
+        Returns the answers and their one-row ``BatchScores``.
+        """
+        answers = {category: st.session_state[category] for category in categories}
+        answer_idx = MODEL.answer_indices(answers)
+        scores = score_batch(
+            MODEL, answer_idx[None, :],
+            [st.session_state["ifr_movements"]], [st.session_state["vfr_movements"]]
+        )
+        return answers, scores
+
+    @st.fragment(key="results")
+    def results_panel():
+        with instrumentation.fragment_run(st.session_state, "results"):
+            # --- Group totals and weighted indices (same path as batch scoring) ---
+            _, scores = current_scores()
+            aero_data = scores.row(0)[2]
+            selected = st.session_state["aerodrome_type"]
+
+            # --- Custom HTML Table (styled like your image) ---
+            html_table = f"""
 <table class="custom-table">
     <tr>
         <th></th>
@@ -555,75 +271,506 @@ with tab1:
 </table>
 """
 
-    st.markdown(html_table, unsafe_allow_html=True)
-
-    import pandas as pd
-    from io import BytesIO
-
-    # --- Prepare DataFrames for export ---
-    # 1️⃣ Questions and selected answers
-    questions_df = pd.DataFrame(list(answers.items()), columns=["Question", "Selected Answer"])
-
-    # 2️⃣ IFR and VFR totals
-    ifr_df = pd.DataFrame(list(ifr_totals.items()), columns=["IFR Group", "IFR Total"])
-    vfr_df = pd.DataFrame(list(vfr_totals.items()), columns=["VFR Group", "VFR Total"])
-
-    # 3️⃣ Final weighted results
-    results_df = pd.DataFrame(list(result.items()), columns=["Aerodrome Type", "Weighted Index"])
-
-    # 4️⃣ Metadata (inputs and ratios)
-    meta_df = pd.DataFrame({
-        "Identifier": [user_name],
-        "IFR Value": [ifr_value],
-        "VFR Value": [vfr_value],
-        "IFR Ratio": [ifr_ratio],
-        "VFR Ratio": [vfr_ratio],
-        "Selected Aerodrome": [selected],
-        "Selected Index": [aero_data[selected]]
-    })
-
-    # --- Combine all data into an Excel file ---
-    output = BytesIO()
-
-    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
-        meta_df.to_excel(writer, index=False, sheet_name="Summary")
-        questions_df.to_excel(writer, index=False, sheet_name="Questions")
-        ifr_df.to_excel(writer, index=False, sheet_name="IFR Totals")
-        vfr_df.to_excel(writer, index=False, sheet_name="VFR Totals")
-        results_df.to_excel(writer, index=False, sheet_name="Weighted Results")
-
-    # Move to start of the BytesIO buffer
-    output.seek(0)
-
-    # --- Streamlit download button ---
-    st.download_button(
-        label="📥 Download Results as Excel",
-        data=output,
-        file_name=f"aerodrome_assessment_{user_name or 'entry'}.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
+            st.markdown(html_table, unsafe_allow_html=True)
+
+    def add_to_portfolio(assessment):
+        instrumentation.start_interaction(st.session_state, "add to portfolio")
+        st.session_state.setdefault("portfolio", {})[assessment[0]] = assessment
+        st.rerun(["export", "portfolio"])
+
+    @st.fragment(key="export")
+    def export_panel():
+        with instrumentation.fragment_run(st.session_state, "export"):
+            # The workbook is built only when the button is clicked and is
+            # memoized per (airport, answers, movements, type); rendering the
+            # button on a rerun does no export work.
+            user_name = st.session_state["airport"]
+            answers = {category: st.session_state[category] for category in categories}
+            build_workbook = functools.partial(
+                assessment_workbook,
+                MODEL,
+                user_name,
+                tuple(MODEL.answer_indices(answers).tolist()),
+                st.session_state["ifr_movements"],
+                st.session_state["vfr_movements"],
+                st.session_state["aerodrome_type"],
+            )
+
+            # --- Streamlit download button ---
+            st.download_button(
+                label="📥 Download Results as Excel",
+                data=build_workbook,
+                file_name=f"aerodrome_assessment_{user_name or 'entry'}.xlsx",
+                mime=XLSX_MIME,
+                on_click="ignore"
+            )
+
+            # Keep this assessment for the portfolio export (one per airport)
+            st.button(
+                "➕ Add to portfolio",
+                on_click=add_to_portfolio,
+                args=(build_workbook.args[1:],),
+                help="Store this assessment so it is included in the Portfolio tab's workbook"
+            )
+
+    @st.fragment(key="diagnostics")
+    def diagnostics_panel():
+        # --- Rerun / CPU diagnostics (counts exclude the run in progress) ---
+        with instrumentation.fragment_run(st.session_state, "diagnostics"), st.expander("Session diagnostics"):
+            st.caption(
+                f"Current assessment ({run_metrics['assessment']}): "
+                f"{run_metrics['reruns']} full reruns, {run_metrics['fragment_runs']} fragment runs, "
+                f"{run_metrics['cpu'] * 1e3:.1f} ms server CPU"
+            )
+            st.dataframe(
+                [
+                    {
+                        "Trigger": interaction["trigger"],
+                        "Fragments run": ", ".join(name for name, _ in interaction["fragments"]),
+                        "Fragment CPU (ms)": round(sum(cpu for _, cpu in interaction["fragments"]), 2),
+                    }
+                    for interaction in reversed(run_metrics["interactions"])
+                ],
+                hide_index=True
+            )
+            if run_metrics["completed"]:
+                st.dataframe(run_metrics["completed"], hide_index=True)
+
+    results_panel()
+    export_panel()
+    diagnostics_panel()
+
+with tab2:
+    # --- Analysis status ---
+    # A full run computes every analysis below from the current answers
+    st.session_state["analyses_stale"] = False
+
+    def refresh_analyses():
+        instrumentation.start_interaction(st.session_state, "refresh analyses")
+        st.session_state["analyses_stale"] = False
+        st.rerun(["analysis-status"] + ANALYSIS_FRAGMENTS)
+
+    @st.fragment(key="analysis-status")
+    def analysis_status_panel():
+        with instrumentation.fragment_run(st.session_state, "analysis-status"):
+            if st.session_state["analyses_stale"]:
+                st.info("Answers have changed since the analyses below were computed.")
+                st.button("Refresh analyses", key="refresh_analyses", on_click=refresh_analyses)
+
+    analysis_status_panel()
+
+    # --- What-if panel ---
+    # Every alternative answer to every question is scored in one pass, so
+    # the highest-leverage changes are listed without trying them one by one.
+    WHATIF_ROWS = 10
+
+    @st.fragment(key="whatif")
+    def whatif_panel():
+        with instrumentation.fragment_run(st.session_state, "whatif"):
+            selected = st.session_state["aerodrome_type"]
+            answers = {category: st.session_state[category] for category in categories}
+            matrix = sensitivity(
+                MODEL, MODEL.answer_indices(answers),
+                st.session_state["ifr_movements"], st.session_state["vfr_movements"]
+            )
+            base = int(matrix.base[AERODROME_TYPES.index(selected)])
+            st.markdown(f"**{selected} index as answered: {base}.** Each row changes one answer and keeps the rest.")
+            st.dataframe(
+                [
+                    {
+                        "Question": question,
+                        "Current Answer": current,
+                        "Alternative": alternative,
+                        "Change": f"{delta:+d}",
+                        f"{selected} Index": base + delta,
+                    }
+                    for question, current, alternative, delta in matrix.changes(selected, WHATIF_ROWS)
+                ],
+                hide_index=True
+            )
+
+    # --- Contribution breakdown ---
+    # What each answer adds to the selected index, straight from the
+    # per-question values score_batch keeps behind the group totals.
+    @st.fragment(key="contributions")
+    def contributions_panel():
+        with instrumentation.fragment_run(st.session_state, "contributions"):
+            selected = st.session_state["aerodrome_type"]
+            t = AERODROME_TYPES.index(selected)
+            answers, scores = current_scores()
+            values = scores.contributions[0]
+            shares = scores.index_contributions()[0, t]
+            st.markdown(
+                f"**Contributions to the {selected} index** — they add up to {shares.sum():.2f}, "
+                f"rounded to {scores.index[0, t]}."
+            )
+            st.dataframe(
+                [
+                    {
+                        "Question": categories[q],
+                        "Answer": answers[categories[q]],
+                        IFR_GROUPS[t]: int(values[t, q]),
+                        VFR_GROUPS[t]: int(values[len(IFR_GROUPS) + t, q]),
+                        f"{selected} Index": round(float(shares[q]), 2),
+                    }
+                    for q in np.argsort(-np.abs(shares), kind="stable").tolist()
+                ],
+                hide_index=True
+            )
+
+    # --- Score distribution ---
+    # Where this index sits among every possible set of answers, from the
+    # exact distribution (cached per model and movements).
+    @st.fragment(key="distribution")
+    def distribution_panel():
+        with instrumentation.fragment_run(st.session_state, "distribution"):
+            selected = st.session_state["aerodrome_type"]
+            _, scores = current_scores()
+            index = int(scores.index[0, AERODROME_TYPES.index(selected)])
+            distribution = index_distribution(
+                MODEL, selected, st.session_state["ifr_movements"], st.session_state["vfr_movements"]
+            )
+            rank = distribution.rank(index)
+            share = f"{rank:.1f}%" if 0.1 <= rank <= 99.9 or rank in (0, 100) else (
+                "under 0.1%" if rank < 0.1 else "over 99.9%"
+            )
+            st.markdown(
+                f"**{selected} index {index}: percentile rank {share} "
+                f"among all {distribution.total:,} possible assessments.**"
+            )
+            st.dataframe(
+                [{
+                    "Minimum": int(distribution.values[0]),
+                    **{f"P{p}": value for p, value in distribution.percentiles().items()},
+                    "Maximum": int(distribution.values[-1]),
+                }],
+                hide_index=True
+            )
+            st.bar_chart(
+                {"Index": distribution.values, "Share of assessments": distribution.shares()},
+                x="Index", y="Share of assessments"
+            )
+
+    # --- Mitigation ---
+    # Cheapest answer changes bringing the selected index down to a target,
+    # solved exactly; costs default to how far each answer moves.
+    @st.fragment(key="mitigation")
+    def mitigation_panel():
+        with instrumentation.fragment_run(st.session_state, "mitigation"):
+            selected = st.session_state["aerodrome_type"]
+            answers, scores = current_scores()
+            answer_idx = MODEL.answer_indices(answers)
+            index = int(scores.index[0, AERODROME_TYPES.index(selected)])
+            st.markdown(f"**Cheapest way to bring the {selected} index ({index}) down to a target**")
+
+            col1, col2 = st.columns(2)
+            with col1:
+                target = st.number_input(
+                    "Target index (at most)", min_value=0, value=max(index - 5, 0), step=1, key="mitigation_target"
+                )
+            with col2:
+                upload = st.file_uploader(
+                    "Mitigation costs (CSV, optional)", type="csv", key="mitigation_costs",
+                    help="One row per question and one cost column per answer; a blank cost rules the answer out"
+                )
+            st.download_button(
+                label="Cost template (current answers)",
+                data=cost_template(MODEL, answer_idx),
+                file_name="mitigation_costs.csv",
+                mime="text/csv",
+                on_click="ignore"
+            )
+
+            costs = None
+            if upload:
+                try:
+                    costs = read_costs(MODEL, io.StringIO(upload.getvalue().decode("utf-8-sig"), newline=""))
+                except ValueError as e:
+                    st.error(f"Cannot read {upload.name}: {e}")
+                    return
+            plan = mitigate(
+                MODEL, answer_idx, selected, target,
+                st.session_state["ifr_movements"], st.session_state["vfr_movements"], costs
+            )
+            if plan is None:
+                st.warning(f"No combination of allowed answers brings the {selected} index to {target} or below.")
+            elif not plan.changes:
+                st.success(f"The {selected} index is already {plan.index}; no changes needed.")
+            else:
+                st.markdown(f"{len(plan.changes)} change(s), total cost {plan.cost:g}, index {index} → {plan.index}")
+                st.dataframe(
+                    [
+                        {"Question": question, "Current Answer": current, "Change To": new, "Cost": cost}
+                        for question, current, new, cost in plan.changes
+                    ],
+                    hide_index=True
+                )
+
+    # --- Uncertainty mode ---
+    # Disputed answers carry a probability and movements a +/- range; the
+    # indices are sampled (Monte Carlo) and memoized on those inputs.
+    @st.fragment(key="uncertainty")
+    def uncertainty_panel():
+        with instrumentation.fragment_run(st.session_state, "uncertainty"):
+            if not st.toggle("Uncertainty mode", key="uncertainty_mode",
+                             help="Give disputed answers a probability and movements a range"):
+                return
+            selected = st.session_state["aerodrome_type"]
+            answers, scores = current_scores()
+            answer_idx = MODEL.answer_indices(answers)
+
+            disputed = st.multiselect("Disputed questions", categories, key="disputed")
+            alternatives = {}
+            for category in disputed:
+                q = categories.index(category)
+                col1, col2 = st.columns([2, 1])
+                with col1:
+                    alternative = st.selectbox(
+                        f"Alternative answer — {category}",
+                        [label for label in SCORES_LABELS[category] if label != answers[category]],
+                        key=f"alternative-{q}"
+                    )
+                with col2:
+                    probability = st.slider("Probability (%)", 0, 100, 50, key=f"alternative-p-{q}")
+                alternatives[q] = (MODEL.answer_index[q][alternative], probability / 100)
+
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                ifr_spread = st.number_input("IFR movements ± %", min_value=0, max_value=100, value=10, key="ifr_spread")
+            with col2:
+                vfr_spread = st.number_input("VFR movements ± %", min_value=0, max_value=100, value=10, key="vfr_spread")
+            with col3:
+                draws = st.select_slider("Draws", [10_000, 100_000, 1_000_000], value=100_000, key="draws")
+
+            def movement_range(value, spread):
+                return round(value * (100 - spread) / 100), round(value * (100 + spread) / 100)
+
+            simulation = simulate(
+                MODEL, answer_probabilities(MODEL, answer_idx, alternatives),
+                movement_range(st.session_state["ifr_movements"], ifr_spread),
+                movement_range(st.session_state["vfr_movements"], vfr_spread),
+                draws
+            )
+            tail = (100 - CONFIDENCE) / 2
+            st.dataframe(
+                [
+                    {
+                        "Aerodrome Type": aerodrome,
+                        "Point Index": int(scores.index[0, t]),
+                        "Mean": round(float(simulation.mean[t]), 2),
+                        f"P{tail:g}": simulation.band(aerodrome)[0],
+                        "Median": simulation.distributions[aerodrome].percentile(50),
+                        f"P{100 - tail:g}": simulation.band(aerodrome)[1],
+                    }
+                    for t, aerodrome in enumerate(AERODROME_TYPES)
+                ],
+                hide_index=True
+            )
+            distribution = simulation.distributions[selected]
+            st.bar_chart(
+                {"Index": distribution.values, "Share of draws": distribution.shares()},
+                x="Index", y="Share of draws"
+            )
+
+    whatif_panel()
+    contributions_panel()
+    distribution_panel()
+    mitigation_panel()
+    uncertainty_panel()
+
+    # --- Movement-mix sweep ---
+    # All types across the whole IFR share range and a grid of movement
+    # counts in one pass, with the shares where the ranking of types changes.
+    # Off by default: the scoring is cheap but drawing the chart is not.
+    SWEEP_GRID = 6
+
+    @st.fragment(key="sweep")
+    def sweep_panel():
+        with instrumentation.fragment_run(st.session_state, "sweep"):
+            if not st.toggle("Movement-mix sweep", key="sweep_mode",
+                             help="Every aerodrome type across the IFR share range and a grid of movement counts"):
+                return
+            selected = st.session_state["aerodrome_type"]
+            _, scores = current_scores()
+            ifr_totals, vfr_totals = scores.ifr_totals[0], scores.vfr_totals[0]
+            ifr_value, vfr_value = st.session_state["ifr_movements"], st.session_state["vfr_movements"]
+            sweep = mix_sweep(ifr_totals, vfr_totals)
+
+            st.markdown("**Index by IFR share of movements**")
+            st.line_chart(
+                {"IFR share (%)": [float(share * 100) for share in sweep.shares],
+                 **{aerodrome: sweep.index[:, t] for t, aerodrome in enumerate(AERODROME_TYPES)}},
+                x="IFR share (%)", y=list(AERODROME_TYPES)
+            )
+            total = ifr_value + vfr_value
+            if sweep.crossovers:
+                st.dataframe(
+                    [
+                        {
+                            "IFR Share (%)": round(float(share * 100), 2),
+                            f"IFR Movements (of {total:,})": round(share * total),
+                            "Higher Below": before,
+                            "Higher Above": after,
+                        }
+                        for share, before, after in sweep.crossovers
+                    ],
+                    hide_index=True
+                )
+            else:
+                st.caption("The ranking of aerodrome types is the same at every IFR share.")
+
+            st.markdown(f"**{selected} index by annual movements**")
+            ifr_counts = np.linspace(0, max(2 * ifr_value, 1000), SWEEP_GRID).round().astype(int)
+            vfr_counts = np.linspace(0, max(2 * vfr_value, 1000), SWEEP_GRID).round().astype(int)
+            grid = movement_grid(ifr_totals, vfr_totals, ifr_counts, vfr_counts)[:, :, AERODROME_TYPES.index(selected)]
+            st.dataframe(
+                [
+                    {"IFR \\ VFR": f"{ifr:,}", **{f"{vfr:,}": int(value) for vfr, value in zip(vfr_counts.tolist(), row)}}
+                    for ifr, row in zip(ifr_counts.tolist(), grid.tolist())
+                ],
+                hide_index=True
+            )
+
+    sweep_panel()
+
+    # --- Movement time series ---
+    # Index per period plus rolling (trailing 12 months) and seasonal
+    # aggregates. The series is kept in the session and only rescored when
+    # the upload or the answers change; added months are scored on their own.
+    @st.fragment(key="timeseries")
+    def timeseries_panel():
+        with instrumentation.fragment_run(st.session_state, "timeseries"):
+            st.markdown("**Monthly movements**")
+            upload = st.file_uploader(
+                "Movement time series (CSV or Excel: Period, IFR Movements, VFR Movements)",
+                type=["csv", "xlsx"], key="movement_upload"
+            )
+            st.download_button(
+                label="CSV template",
+                data=movement_template(),
+                file_name="movements_template.csv",
+                mime="text/csv",
+                on_click="ignore"
+            )
+            if not upload:
+                return
+
+            _, scores = current_scores()
+            key = (upload.file_id, tuple(scores.ifr_totals[0].tolist()), tuple(scores.vfr_totals[0].tolist()))
+            cached = st.session_state.get("movement_series")
+            if cached is None or cached[0] != key:
+                if cached is not None and cached[0][0] == upload.file_id:
+                    # Same upload, new answers: rescore the periods held so far
+                    periods, (ifr, vfr) = cached[1].periods, cached[1].movements.T
+                else:
+                    try:
+                        if upload.name.lower().endswith(".xlsx"):
+                            periods, ifr, vfr = read_movements_xlsx(io.BytesIO(upload.getvalue()))
+                        else:
+                            periods, ifr, vfr = read_movements(
+                                io.StringIO(upload.getvalue().decode("utf-8-sig"), newline="")
+                            )
+                    except ValueError as e:
+                        st.error(f"Cannot read {upload.name}: {e}")
+                        return
+                series = MovementSeries(scores.ifr_totals[0], scores.vfr_totals[0])
+                series.extend(periods, ifr, vfr)
+                cached = st.session_state["movement_series"] = (key, series)
+            series = cached[1]
+            if not len(series):
+                st.warning(f"{upload.name} has no periods.")
+                return
+
+            with st.form("add_month", border=False):
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    period = st.text_input("Next period (YYYY-MM)")
+                with col2:
+                    ifr_value = st.number_input("IFR movements", min_value=0, step=100, format="%d")
+                with col3:
+                    vfr_value = st.number_input("VFR movements", min_value=0, step=100, format="%d")
+                if st.form_submit_button("Add month"):
+                    try:
+                        series.append(period, ifr_value, vfr_value)
+                    except ValueError as e:
+                        st.error(str(e))
+
+            selected = st.session_state["aerodrome_type"]
+            t = AERODROME_TYPES.index(selected)
+            st.line_chart(
+                {"Period": series.periods, f"{selected} (month)": series.index[:, t],
+                 f"{selected} (rolling {series.window} months)": series.rolling_index[:, t]},
+                x="Period", y=[f"{selected} (month)", f"{selected} (rolling {series.window} months)"]
+            )
+            months, seasonal = series.seasonal_index()
+            st.dataframe(
+                [
+                    {"Month": month, **dict(zip(AERODROME_TYPES, row))}
+                    for month, row in zip(months.tolist(), seasonal.tolist())
+                ],
+                hide_index=True
+            )
+
+    timeseries_panel()
+
+with tab3:
+    # --- Portfolio export ---
+    # Every stored assessment plus any uploaded CSV rows go into one
+    # workbook, scored in batches and streamed to disk while it is written.
+    @st.fragment(key="portfolio")
+    def portfolio_panel():
+        stored = st.session_state.get("portfolio", {})
+        st.markdown(f"**{len(stored)} stored assessment(s)** — add more with *Add to portfolio* on the Main Inputs tab.")
+        if stored:
+            st.dataframe(
+                [
+                    {"Identifier": airport, "IFR Value": ifr, "VFR Value": vfr, "Selected Aerodrome": kind}
+                    for airport, _, ifr, vfr, kind in stored.values()
+                ],
+                hide_index=True
+            )
+            if st.button("Clear stored assessments"):
+                st.session_state["portfolio"] = {}
+                st.rerun(scope="fragment")
+
+        st.download_button(
+            label="CSV template",
+            data=portfolio_template(MODEL),
+            file_name="portfolio_template.csv",
+            mime="text/csv",
+            on_click="ignore"
+        )
+        upload = st.file_uploader(
+            "Batch-scored assessments (CSV, one row per aerodrome)", type="csv", key="portfolio_upload"
+        )
+        uploaded = []
+        if upload:
+            try:
+                uploaded = list(read_assessments(MODEL, io.StringIO(upload.getvalue().decode("utf-8-sig"), newline="")))
+            except ValueError as e:
+                st.error(f"Cannot read {upload.name}: {e}")
+
+        # Uploaded rows replace stored assessments of the same aerodrome
+        portfolio = {**stored, **{assessment[0]: assessment for assessment in uploaded}}
+        st.download_button(
+            label=f"📥 Download Portfolio as Excel ({len(portfolio)} aerodromes)",
+            data=functools.partial(portfolio_workbook, MODEL, list(portfolio.values())),
+            file_name="aerodrome_portfolio.xlsx",
+            mime=XLSX_MIME,
+            on_click="ignore",
+            disabled=not portfolio
+        )
+
+    portfolio_panel()
 
 # --- Footer ---
 st.markdown(
     """
-    <style>
-    .footer {
-        position: fixed;
-        left: 0;
-        bottom: 0;
-        width: 100%;
-        background-color: #f4f6f8;
-        color: #333333;
-        text-align: center;
-        padding: 10px 0;
-        font-size: 12px;
-        border-top: 1px solid #e0e0e0;
-    }
-    </style>
-
     <div class="footer">
     No part of this application may be used, reproduced and/or disclosed in any form or by any means without the prior written permission of the Mike Haines Aviation Limited.© 2026 – All rights reserved
     </div>
     """,
     unsafe_allow_html=True
-)
\ No newline at end of file
+)
+
+instrumentation.end_run(st.session_state)
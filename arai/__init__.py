@@ -0,0 +1,50 @@
+"""Aerodrome risk assessment core: scoring tables, indices and exports.
+
+Nothing here imports Streamlit or pandas, so scripts, benchmarks and
+workers can score assessments without the app.  Submodules load on first
+attribute access: ``import arai`` costs nothing, ``arai.score_batch`` pulls
+in NumPy, and xlsxwriter is only imported when a workbook is written.
+
+    import arai
+    model = arai.load_model()
+    scores = arai.score_batch(model, answer_idx, ifr_movements, vfr_movements)
+"""
+import importlib
+
+_EXPORTS = {
+    "scoring": (
+        "AERODROME_TYPES", "FEEDBACK_GROUPS", "GROUPS", "IFR_GROUPS", "VFR_GROUPS",
+        "NORMALISATION", "NORMALISATION_RATIO",
+        "BatchScores", "ScoreTable", "ScoreTableError", "ScoringModel",
+        "compile_model", "compile_table", "score_batch", "weighted_index",
+    ),
+    "whatif": ("Sensitivity", "sensitivity"),
+    "distribution": ("Distribution", "JointDistribution", "index_distribution", "joint_distributions"),
+    "mitigation": ("Mitigation", "distance_costs", "mitigate", "read_costs"),
+    "uncertainty": ("Simulation", "answer_probabilities", "simulate"),
+    "sweep": ("MixSweep", "crossovers", "mix_sweep", "movement_grid"),
+    "timeseries": ("MovementSeries", "read_movements", "read_movements_xlsx"),
+    "table_cache": ("TableStore", "load_model"),
+    "export": ("assessment_workbook", "portfolio_template", "portfolio_workbook",
+               "read_assessments", "write_portfolio"),
+}
+
+_SOURCES = {name: module for module, names in _EXPORTS.items() for name in names}
+_SUBMODULES = ("distribution", "export", "mitigation", "report", "scoring", "sweep", "table_cache", "timeseries", "uncertainty", "whatif")
+
+__all__ = sorted(_SOURCES)
+
+
+def __getattr__(name):
+    if name in _SOURCES:
+        value = getattr(importlib.import_module(f".{_SOURCES[name]}", __name__), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_SUBMODULES))
@@ -0,0 +1,173 @@
+"""Exact distribution of the scores over every possible set of answers.
+
+A group total is a sum of one value per question, so the number of answer
+combinations giving each total is the convolution of the per-question value
+histograms; 20 questions with 5 answers each (5**20 combinations) take 20
+small convolutions instead of enumeration.  A weighted index depends on an
+IFR and a VFR total together, so ``JointDistribution`` convolves the pair
+on a 2-D grid and maps every reachable ``(IFR total, VFR total)`` cell
+through ``weighted_index``.  Counts are exact integers.
+
+The joint grids depend only on the scoring tables and are cached per model;
+the index distribution additionally depends on the movements.
+"""
+import functools
+from fractions import Fraction
+from math import prod
+
+import numpy as np
+
+from .scoring import AERODROME_TYPES, IFR_GROUPS, VFR_GROUPS, weighted_index
+
+# Models (table versions) whose joint distributions are kept
+DISTRIBUTION_CACHE_SIZE = 4
+
+# Index distributions (model, type, movements) kept
+INDEX_CACHE_SIZE = 64
+
+# Percentiles shown by default
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+class Distribution:
+    """Number of answer combinations giving each score.
+
+    ``values`` are the distinct reachable scores in increasing order and
+    ``counts[i]`` the number of combinations scoring ``values[i]``.
+    """
+
+    def __init__(self, values, counts):
+        self.values = values
+        self.counts = counts
+        self.cumulative = np.cumsum(counts)
+        self.total = int(self.cumulative[-1])
+
+    def percentile(self, p):
+        """Smallest score reached by at least ``p`` percent of combinations."""
+        threshold = Fraction(p) * self.total / 100
+        i = np.searchsorted(self.cumulative, -(-threshold.numerator // threshold.denominator))
+        return int(self.values[min(i, len(self.values) - 1)])
+
+    def percentiles(self, ps=PERCENTILES):
+        return {p: self.percentile(p) for p in ps}
+
+    def rank(self, score):
+        """Percentage of combinations scoring below ``score``, counting ties as half."""
+        below = np.searchsorted(self.values, score, side="left")
+        upto = np.searchsorted(self.values, score, side="right")
+        below_count = int(self.cumulative[below - 1]) if below else 0
+        upto_count = int(self.cumulative[upto - 1]) if upto else 0
+        return float(Fraction(below_count + upto_count, 2 * self.total) * 100)
+
+    def shares(self):
+        """Fraction of combinations giving each score, as floats."""
+        return self.counts / self.total
+
+
+def _collapse(values, counts):
+    """Sum ``counts`` over equal ``values``; returns a ``Distribution``."""
+    order = np.argsort(values, kind="stable")
+    values, counts = values[order], counts[order]
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    return Distribution(values[starts], np.add.reduceat(counts, starts))
+
+
+def _axis(values):
+    """Grid axis for per-question ``values`` lists: (offset, step, cell shifts)."""
+    lows = [min(v) for v in values]
+    step = int(np.gcd.reduce([x - low for v, low in zip(values, lows) for x in v])) or 1
+    return sum(lows), step, [[(x - low) // step for x in v] for v, low in zip(values, lows)]
+
+
+def grid_shape(shifts):
+    """Shape of the grid holding every sum of per-question ``(i, j)`` shifts."""
+    return (sum(max(di for di, _ in s) for s in shifts) + 1,
+            sum(max(dj for _, dj in s) for s in shifts) + 1)
+
+
+class JointDistribution:
+    """Exact distribution of ``(IFR total, VFR total)`` for one aerodrome type.
+
+    ``counts[i, j]`` is the number of answer combinations with IFR total
+    ``ifr_offset + i * ifr_step``.  IFR and VFR values of a question mostly
+    move together, so the second axis tracks ``VFR total - IFR total`` when
+    that keeps the grid smaller than tracking the VFR total itself
+    (``relative`` is then True).  ``answer_columns[q]`` lists the answer
+    columns question ``q`` offers and ``shifts[q]`` the ``(i, j)`` cell
+    offset each of them adds.
+    """
+
+    def __init__(self, model, aerodrome_type):
+        t = AERODROME_TYPES.index(aerodrome_type)
+        ifr = model.values[model.group_index[IFR_GROUPS[t]]]
+        vfr = model.values[model.group_index[VFR_GROUPS[t]]]
+        self.answer_columns = [sorted(labels) for labels in model.answer_label]
+        # (IFR value, VFR value) of every answer each question offers
+        answers = [[(int(ifr[q, a]), int(vfr[q, a])) for a in columns]
+                   for q, columns in enumerate(self.answer_columns)]
+
+        ifr_axis = _axis([[i for i, _ in pairs] for pairs in answers])
+        vfr_axis = _axis([[v for _, v in pairs] for pairs in answers])
+        diff_axis = _axis([[v - i for i, v in pairs] for pairs in answers])
+        size = lambda axis: sum(max(shifts) for shifts in axis[2])  # noqa: E731
+        self.relative = size(diff_axis) < size(vfr_axis)
+        second_axis = diff_axis if self.relative else vfr_axis
+
+        self.ifr_offset, self.ifr_step, ifr_shifts = ifr_axis
+        self.second_offset, self.second_step, second_shifts = second_axis
+        self.shifts = [list(zip(i, j)) for i, j in zip(ifr_shifts, second_shifts)]
+        self.counts = self._convolve(self.shifts, prod(map(len, answers)))
+
+    @staticmethod
+    def _convolve(shifts, total):
+        """Histogram of summed ``(i, j)`` cell shifts, one list of shifts per question."""
+        # int64 holds the counts unless there are 2**63 or more combinations
+        dtype = np.int64 if total < 2 ** 63 else object
+        counts = np.zeros(grid_shape(shifts), dtype=dtype)
+        counts[0, 0] = 1
+        h = w = 1
+        for question_shifts in shifts:
+            current = counts[:h, :w].copy()
+            counts[:h, :w] = 0
+            for di, dj in question_shifts:
+                counts[di:di + h, dj:dj + w] += current
+            h += max(di for di, _ in question_shifts)
+            w += max(dj for _, dj in question_shifts)
+        return counts
+
+    def totals(self, i, j):
+        """``(ifr_totals, vfr_totals)`` of grid cells ``(i, j)``."""
+        ifr_totals = self.ifr_offset + i * self.ifr_step
+        vfr_totals = self.second_offset + j * self.second_step
+        if self.relative:
+            vfr_totals = vfr_totals + ifr_totals
+        return ifr_totals, vfr_totals
+
+    def cells(self):
+        """``(ifr_totals, vfr_totals, counts)`` of every reachable cell."""
+        i, j = np.nonzero(self.counts)
+        return *self.totals(i, j), self.counts[i, j]
+
+    def ifr_distribution(self):
+        ifr_totals, _, counts = self.cells()
+        return _collapse(ifr_totals, counts)
+
+    def vfr_distribution(self):
+        _, vfr_totals, counts = self.cells()
+        return _collapse(vfr_totals, counts)
+
+    def index_distribution(self, ifr_movements, vfr_movements):
+        ifr_totals, vfr_totals, counts = self.cells()
+        return _collapse(weighted_index(ifr_totals, vfr_totals, ifr_movements, vfr_movements), counts)
+
+
+@functools.lru_cache(maxsize=DISTRIBUTION_CACHE_SIZE)
+def joint_distributions(model):
+    """``{aerodrome type: JointDistribution}`` for ``model``, built once per model."""
+    return {aerodrome: JointDistribution(model, aerodrome) for aerodrome in AERODROME_TYPES}
+
+
+@functools.lru_cache(maxsize=INDEX_CACHE_SIZE)
+def index_distribution(model, aerodrome_type, ifr_movements, vfr_movements):
+    """Exact distribution of the ``aerodrome_type`` index over all answer combinations."""
+    return joint_distributions(model)[aerodrome_type].index_distribution(ifr_movements, vfr_movements)
@@ -0,0 +1,191 @@
+"""Excel export of a single assessment and of a multi-aerodrome portfolio.
+
+The workbook is only built when the download is actually requested (the app
+passes a callable to ``st.download_button``) and the bytes are memoized on a
+compact key -- model, airport, answer columns, movements and aerodrome type
+-- so repeated downloads of the same assessment are served from memory.
+The memo is a bounded LRU so long-lived servers do not grow without limit.
+Sheets are written straight to xlsxwriter by ``report.ReportWriter``; pandas
+is not needed.
+
+A portfolio is any iterable of ``(identifier, answer_idx, ifr_value,
+vfr_value, selected)`` assessments -- stored in the session or read from an
+uploaded CSV by ``read_assessments``.  It is scored ``PORTFOLIO_CHUNK`` rows
+at a time and streamed into a workbook on disk, so memory stays bounded by
+the chunk size however many aerodromes it holds.
+"""
+import csv
+import functools
+import itertools
+import tempfile
+from io import BytesIO
+
+from .report import ReportWriter
+from .scoring import AERODROME_TYPES, IFR_GROUPS, VFR_GROUPS, score_batch
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Distinct assessments kept in the process-wide workbook memo
+EXPORT_CACHE_SIZE = 64
+
+# Portfolio assessments scored per vectorized batch
+PORTFOLIO_CHUNK = 512
+
+# Leading CSV columns of an uploaded portfolio; one column per question follows
+PORTFOLIO_COLUMNS = ["Identifier", "IFR Value", "VFR Value", "Selected Aerodrome"]
+
+
+# Per-question columns after the answer: group values, then index shares
+CONTRIBUTION_COLUMNS = (["Question", "Selected Answer"] + list(IFR_GROUPS) + list(VFR_GROUPS)
+                        + [f"{aerodrome} Index" for aerodrome in AERODROME_TYPES])
+
+
+def contribution_rows(answers, contributions, shares, prefix=()):
+    """Rows of ``CONTRIBUTION_COLUMNS`` for one assessment.
+
+    ``contributions`` is its ``(G, Q)`` slice of ``BatchScores.contributions``
+    and ``shares`` its ``(4, Q)`` slice of ``index_contributions()``.
+    """
+    for (question, answer), value, share in zip(answers.items(), contributions.T.tolist(), shares.T.tolist()):
+        yield [*prefix, question, answer] + value + share
+
+
+@functools.lru_cache(maxsize=EXPORT_CACHE_SIZE)
+def assessment_workbook(model, airport, answer_idx, ifr_value, vfr_value, selected):
+    """Return the xlsx bytes for one assessment.
+
+    ``answer_idx`` is a tuple of answer columns (hashable, so it can be part
+    of the memo key); everything else is rescored from it.
+    """
+    answers = model.answer_labels(answer_idx)
+    scores = score_batch(model, [answer_idx], [ifr_value], [vfr_value])
+    ifr_totals, vfr_totals, result = scores.row(0)
+
+    output = BytesIO()
+
+    with ReportWriter(output) as writer:
+        # 4️⃣ Metadata (inputs and ratios)
+        writer.add_sheet("Summary", [
+            "Identifier", "IFR Value", "VFR Value", "IFR Ratio", "VFR Ratio",
+            "Selected Aerodrome", "Selected Index",
+        ])
+        writer.write_row("Summary", [
+            airport, ifr_value, vfr_value,
+            float(scores.ifr_ratio[0]), float(scores.vfr_ratio[0]),
+            selected, result[selected],
+        ])
+
+        # 1️⃣ Questions and selected answers
+        writer.add_sheet("Questions", ["Question", "Selected Answer"])
+        writer.write_rows("Questions", answers.items())
+
+        # 2️⃣ IFR and VFR totals
+        writer.add_sheet("IFR Totals", ["IFR Group", "IFR Total"])
+        writer.write_rows("IFR Totals", ifr_totals.items())
+        writer.add_sheet("VFR Totals", ["VFR Group", "VFR Total"])
+        writer.write_rows("VFR Totals", vfr_totals.items())
+
+        # 3️⃣ Final weighted results
+        writer.add_sheet("Weighted Results", ["Aerodrome Type", "Weighted Index"])
+        writer.write_rows("Weighted Results", result.items())
+
+        # 5️⃣ What each answer contributes to the group totals and indices
+        writer.add_sheet("Contributions", CONTRIBUTION_COLUMNS)
+        writer.write_rows("Contributions", contribution_rows(
+            answers, scores.contributions[0], scores.index_contributions()[0]
+        ))
+
+    return output.getvalue()
+
+
+def portfolio_template(model):
+    """Header line of the portfolio CSV expected by ``read_assessments``."""
+    return ",".join(f'"{column}"' for column in PORTFOLIO_COLUMNS + list(model.questions)) + "\n"
+
+
+def read_assessments(model, lines):
+    """Yield portfolio assessments from CSV ``lines`` (a text file or iterable).
+
+    Raises ``ValueError`` naming the row and column of the first bad value,
+    or the row that repeats an identifier.
+    """
+    reader = csv.DictReader(lines)
+    missing = [c for c in PORTFOLIO_COLUMNS + list(model.questions) if c not in (reader.fieldnames or ())]
+    if missing:
+        raise ValueError(f"missing columns: {', '.join(missing)}")
+
+    seen = set()
+    for row_number, row in enumerate(reader, start=2):
+        identifier = row["Identifier"]
+        if identifier in seen:
+            raise ValueError(f"row {row_number}: identifier {identifier!r} appears twice")
+        seen.add(identifier)
+        try:
+            ifr_value = int(row["IFR Value"])
+            vfr_value = int(row["VFR Value"])
+        except ValueError:
+            raise ValueError(f"row {row_number}: movements must be whole numbers") from None
+        if ifr_value < 0 or vfr_value < 0:
+            raise ValueError(f"row {row_number}: movements must not be negative")
+        selected = row["Selected Aerodrome"]
+        if selected not in AERODROME_TYPES:
+            raise ValueError(f"row {row_number}: unknown aerodrome type {selected!r}")
+        answer_idx = []
+        for q, question in enumerate(model.questions):
+            column = model.answer_index[q].get(row[question])
+            if column is None:
+                raise ValueError(f"row {row_number}: {row[question]!r} is not an answer to {question!r}")
+            answer_idx.append(column)
+        yield identifier, tuple(answer_idx), ifr_value, vfr_value, selected
+
+
+def write_portfolio(output, model, assessments):
+    """Stream a portfolio workbook to ``output``; returns the number of aerodromes.
+
+    The Portfolio sheet has one row per aerodrome, IFR Totals / VFR Totals
+    its group totals and Answers its selected answers; Question Detail has
+    one row per aerodrome and question with its contribution to every group
+    and weighted index.
+    """
+    questions = list(model.questions)
+    count = 0
+    with ReportWriter(output) as writer:
+        writer.add_sheet("Portfolio", [
+            "Identifier", "IFR Value", "VFR Value", "IFR Ratio", "VFR Ratio",
+            "Selected Aerodrome", "Selected Index",
+        ] + [f"{aerodrome} Index" for aerodrome in AERODROME_TYPES])
+        writer.add_sheet("IFR Totals", ["Identifier"] + list(IFR_GROUPS))
+        writer.add_sheet("VFR Totals", ["Identifier"] + list(VFR_GROUPS))
+        writer.add_sheet("Answers", ["Identifier"] + questions)
+        writer.add_sheet("Question Detail", ["Identifier"] + CONTRIBUTION_COLUMNS)
+
+        assessments = iter(assessments)
+        while chunk := list(itertools.islice(assessments, PORTFOLIO_CHUNK)):
+            identifiers, answer_idx, ifr_values, vfr_values, selected = zip(*chunk)
+            scores = score_batch(model, answer_idx, ifr_values, vfr_values)
+            shares = scores.index_contributions()
+
+            for i, identifier in enumerate(identifiers):
+                ifr_totals, vfr_totals, result = scores.row(i)
+                writer.write_row("Portfolio", [
+                    identifier, ifr_values[i], vfr_values[i],
+                    float(scores.ifr_ratio[i]), float(scores.vfr_ratio[i]),
+                    selected[i], result[selected[i]],
+                ] + list(result.values()))
+                writer.write_row("IFR Totals", [identifier] + list(ifr_totals.values()))
+                writer.write_row("VFR Totals", [identifier] + list(vfr_totals.values()))
+                answers = model.answer_labels(answer_idx[i])
+                writer.write_row("Answers", [identifier] + list(answers.values()))
+                writer.write_rows("Question Detail", contribution_rows(
+                    answers, scores.contributions[i], shares[i], prefix=(identifier,)
+                ))
+            count += len(chunk)
+    return count
+
+
+def portfolio_workbook(model, assessments):
+    """Return the xlsx bytes of a portfolio, streamed through a temporary file."""
+    with tempfile.TemporaryFile() as f:
+        write_portfolio(f, model, assessments)
+        f.seek(0)
+        return f.read()
@@ -0,0 +1,149 @@
+"""Cheapest set of answer changes that brings an index down to a target.
+
+Whether an assessment meets the target depends only on its IFR and VFR
+totals, and every question adds its own value to each, so the problem is a
+multiple-choice knapsack over the same ``(IFR total, VFR total)`` grid as
+``distribution.JointDistribution``.  ``mitigate`` runs a min-cost dynamic
+programme over that grid, one question at a time, keeping the answer chosen
+for every cell; the cheapest cell whose index meets the target is then
+traced back to the answers that reach it.  The result is exact and takes a
+few milliseconds for any target.
+
+Costs are a ``(questions, answer columns)`` table: ``costs[q, a]`` is the
+cost of answering question ``q`` with column ``a`` (``inf`` rules it out).
+By default moving an answer costs the number of columns it moves.
+"""
+import csv
+
+import numpy as np
+
+from .distribution import grid_shape, joint_distributions
+from .scoring import weighted_index
+
+
+class Mitigation:
+    """Cheapest answers found by ``mitigate`` for one aerodrome type.
+
+    ``answer_idx`` are the new answer columns, ``cost`` their total cost and
+    ``index`` the index they give; ``changes`` lists ``(question, current
+    label, new label, cost)`` for every question whose answer changes.
+    """
+
+    def __init__(self, model, answer_idx, new_idx, costs, index):
+        self.answer_idx = new_idx
+        self.index = index
+        per_question = costs[np.arange(len(new_idx)), new_idx]
+        self.cost = float(per_question.sum())
+        self.changes = [
+            (model.questions[q], model.answer_label[q][int(answer_idx[q])],
+             model.answer_label[q][int(new_idx[q])], float(per_question[q]))
+            for q in np.flatnonzero(new_idx != answer_idx).tolist()
+        ]
+
+
+def distance_costs(model, answer_idx):
+    """Default costs: how many answer columns each answer moves, ``inf`` where not offered."""
+    columns = np.arange(len(model.answer_keys))
+    costs = np.abs(columns[None, :] - np.asarray(answer_idx)[:, None]).astype(np.float64)
+    for q, labels in enumerate(model.answer_label):
+        costs[q, [a for a in columns if a not in labels]] = np.inf
+    return costs
+
+
+def mitigate(model, answer_idx, aerodrome_type, target, ifr_movements, vfr_movements, costs=None):
+    """Cheapest answers giving an ``aerodrome_type`` index of at most ``target``.
+
+    ``answer_idx`` is the ``(Q,)`` array of current answer columns and
+    ``costs`` a ``(Q, A)`` cost table (``distance_costs`` by default).
+    Ties in cost go to the lower index; equally cheap ways of reaching the
+    same totals keep current answers where they can.
+    Returns a ``Mitigation``, or None if no answers reach the target.
+    """
+    answer_idx = np.asarray(answer_idx, dtype=np.intp)
+    costs = distance_costs(model, answer_idx) if costs is None else np.asarray(costs, dtype=np.float64)
+    if costs.shape != model.values.shape[1:]:
+        raise ValueError(f"costs must have shape {model.values.shape[1:]}, got {costs.shape}")
+    if not (costs >= 0).all():
+        raise ValueError("costs must be non-negative numbers")
+    joint = joint_distributions(model)[aerodrome_type]
+
+    # best[i, j]: cheapest cost of the questions so far summing to cell (i, j);
+    # choice[q][i, j]: answer column question q takes on that cheapest path
+    best = np.full(grid_shape(joint.shifts), np.inf)
+    best[0, 0] = 0.0
+    choice = []
+    h = w = 1
+    for q, (columns, shifts) in enumerate(zip(joint.answer_columns, joint.shifts)):
+        current = best[:h, :w].copy()
+        best[:h, :w] = np.inf
+        chosen = np.full(best.shape, -1, dtype=np.int8)
+        # The current answer goes first so that it wins ties
+        for a, (di, dj) in sorted(zip(columns, shifts), key=lambda item: item[0] != answer_idx[q]):
+            candidate = current + costs[q, a]
+            region = best[di:di + h, dj:dj + w]
+            better = candidate < region
+            region[better] = candidate[better]
+            chosen[di:di + h, dj:dj + w][better] = a
+        choice.append(chosen)
+        h += max(di for di, _ in shifts)
+        w += max(dj for _, dj in shifts)
+
+    i, j = np.nonzero(np.isfinite(best))
+    index = weighted_index(*joint.totals(i, j), ifr_movements, vfr_movements)
+    feasible = np.flatnonzero(index <= target)
+    if not len(feasible):
+        return None
+    k = feasible[np.lexsort((index[feasible], best[i[feasible], j[feasible]]))[0]]
+
+    cell_i, cell_j = int(i[k]), int(j[k])
+    new_idx = np.empty_like(answer_idx)
+    for q in reversed(range(len(choice))):
+        a = int(choice[q][cell_i, cell_j])
+        di, dj = joint.shifts[q][joint.answer_columns[q].index(a)]
+        new_idx[q] = a
+        cell_i, cell_j = cell_i - di, cell_j - dj
+    return Mitigation(model, answer_idx, new_idx, costs, int(index[k]))
+
+
+def cost_template(model, answer_idx):
+    """CSV of the default costs for ``answer_idx``, in the layout ``read_costs`` expects."""
+    costs = distance_costs(model, answer_idx)
+    lines = [",".join(["Question"] + [str(key) for key in model.answer_keys])]
+    for question, row in zip(model.questions, costs.tolist()):
+        lines.append(",".join([f'"{question}"'] + ["" if np.isinf(c) else f"{c:g}" for c in row]))
+    return "\n".join(lines) + "\n"
+
+
+def read_costs(model, lines):
+    """Read a ``(Q, A)`` cost table from CSV ``lines`` (a text file or iterable).
+
+    One row per question, one column per answer key; a blank cell rules the
+    answer out.  Raises ``ValueError`` naming the first bad row or value.
+    """
+    reader = csv.DictReader(lines)
+    keys = [str(key) for key in model.answer_keys]
+    missing = [c for c in ["Question"] + keys if c not in (reader.fieldnames or ())]
+    if missing:
+        raise ValueError(f"missing columns: {', '.join(missing)}")
+
+    costs = np.full(model.values.shape[1:], np.inf)
+    seen = set()
+    for row_number, row in enumerate(reader, start=2):
+        q = model.question_index.get(row["Question"])
+        if q is None:
+            raise ValueError(f"row {row_number}: unknown question {row['Question']!r}")
+        seen.add(q)
+        for a, key in enumerate(keys):
+            cell = (row[key] or "").strip()
+            if not cell:
+                continue
+            try:
+                costs[q, a] = float(cell)
+            except ValueError:
+                raise ValueError(f"row {row_number}: cost {cell!r} for answer {key} is not a number") from None
+            if not costs[q, a] >= 0:
+                raise ValueError(f"row {row_number}: cost for answer {key} must be a non-negative number")
+    unlisted = [model.questions[q] for q in range(len(model.questions)) if q not in seen]
+    if unlisted:
+        raise ValueError(f"missing questions: {', '.join(unlisted)}")
+    return costs
@@ -0,0 +1,50 @@
+"""Streaming xlsx report writer built directly on xlsxwriter.
+
+``ReportWriter`` writes tabular sheets row by row with xlsxwriter's
+``constant_memory`` mode: each row is flushed to the sheet's temporary file
+as soon as the next one starts, so a workbook with thousands of rows never
+holds them all in memory.  Rows must be appended in order within a sheet,
+but sheets can be interleaved freely.
+
+The layout matches ``DataFrame.to_excel(index=False)``: a header row of
+column names in row 0 and one row per record below it.
+
+xlsxwriter is imported when the first writer is created, so importing this
+module (and the app's export code) costs nothing until an export is built.
+"""
+
+
+class ReportWriter:
+    """Write named sheets of rows to ``output`` (a path or binary file object)."""
+
+    def __init__(self, output):
+        import xlsxwriter
+
+        self.workbook = xlsxwriter.Workbook(output, {"constant_memory": True})
+        self._sheets = {}  # name -> [worksheet, next row]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def add_sheet(self, name, columns):
+        """Create sheet ``name`` with a header row of ``columns``."""
+        worksheet = self.workbook.add_worksheet(name)
+        worksheet.write_row(0, 0, columns)
+        self._sheets[name] = [worksheet, 1]
+
+    def write_row(self, name, values):
+        """Append one row of plain Python values to sheet ``name``."""
+        sheet = self._sheets[name]
+        sheet[0].write_row(sheet[1], 0, values)
+        sheet[1] += 1
+
+    def write_rows(self, name, rows):
+        for values in rows:
+            self.write_row(name, values)
+
+    def close(self):
+        self.workbook.close()
+
@@ -0,0 +1,562 @@
+"""Compiled scoring model for the aerodrome complexity tables.
+
+The adjusted IFR/VFR YAML tables are nested ``group -> question -> answer ->
+{value, percentage}`` dicts.  ``compile_model`` flattens them once into dense
+``(group, question, answer)`` integer arrays so that a whole assessment is
+scored with one fancy-index-and-sum instead of walking the dicts.
+
+Compilation happens in two steps: ``compile_table`` turns one source file
+into a ``ScoreTable`` (independent of any other file, so it can be cached and
+shared by content hash) and ``assemble_model`` lays the tables out in the
+question order of ``scores.yaml``.
+
+Both steps validate their input and raise ``ScoreTableError`` listing every
+problem found -- a missing group, question or answer, or a value or
+percentage that is not an integral number -- so a bad table fails when it is
+loaded and the scoring path itself is a plain indexed read with no
+fallbacks.
+
+Compiled tables and models are shared by every session of the app, so they
+are read-only: arrays are not writeable, mappings are ``MappingProxyType``
+and attribute assignment raises ``AttributeError``.
+"""
+from fractions import Fraction
+from math import lcm
+from types import MappingProxyType
+
+import numpy as np
+
+IFR_GROUPS = ("IFR", "UNICOM-I", "AFIS-I", "ATC-I")
+VFR_GROUPS = ("VFR", "UNICOM-V", "AFIS-V", "ATC-V")
+GROUPS = IFR_GROUPS + VFR_GROUPS
+
+# Groups a table may leave out; they score 0. No sheet produces a VFR group,
+# so the VFR side of an unattended aerodrome has always scored 0.
+OPTIONAL_GROUPS = ("VFR",)
+
+# Aerodrome types, paired position by position with IFR_GROUPS / VFR_GROUPS
+# exactly as app.py zips them into the weighted results.
+AERODROME_TYPES = ("Unattended", "ATC", "AFIS", "UNICOM/AWIB")
+
+# Groups whose percentage adjustment is shown above each selectbox
+FEEDBACK_GROUPS = ("UNICOM-I", "AFIS-I", "ATC-I")
+
+# Normalisation applied to the movement-weighted totals
+NORMALISATION = 0.145455
+# The same constant as an exact rational, used for the weighted index
+NORMALISATION_RATIO = Fraction("0.145455")
+
+# IFR/VFR split assumed when an aerodrome reports no movements at all
+DEFAULT_IFR_RATIO = 0.25
+DEFAULT_VFR_RATIO = 0.75
+# ... as integer movement weights (0.25 : 0.75 = 1 : 3)
+DEFAULT_MOVEMENT_WEIGHTS = (1, 3)
+
+# Intermediates of the exact rounding path at or above this bound are
+# computed with Python integers instead of int64
+INT64_LIMIT = 2 ** 62
+
+
+# Problems listed in a ScoreTableError message; the rest are counted
+MAX_REPORTED_PROBLEMS = 25
+
+
+class ScoreTableError(ValueError):
+    """A scoring table is incomplete or malformed; ``problems`` lists every issue."""
+
+    def __init__(self, problems, source=None):
+        self.problems = list(problems)
+        self.source = source
+        lines = [f"  - {problem}" for problem in self.problems[:MAX_REPORTED_PROBLEMS]]
+        if len(self.problems) > MAX_REPORTED_PROBLEMS:
+            lines.append(f"  ... and {len(self.problems) - MAX_REPORTED_PROBLEMS} more")
+        super().__init__(
+            f"{source or 'scoring table'}: {len(self.problems)} problem(s)\n" + "\n".join(lines)
+        )
+
+
+def _readonly(array):
+    array.setflags(write=False)
+    return array
+
+
+class _ReadOnly:
+    """Instances refuse attribute assignment once ``__init__`` has finished."""
+
+    _frozen = False
+
+    def __setattr__(self, name, value):
+        if self._frozen:
+            raise AttributeError(f"{type(self).__name__} is read-only")
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+
+class ScoringModel(_ReadOnly):
+    """Dense view of the scoring tables.
+
+    ``values[g, q, a]`` and ``percentages[g, q, a]`` hold the table entry for
+    group ``GROUPS[g]``, question ``questions[q]`` and answer column ``a``.
+    ``assemble_model`` requires every entry to be defined, so all of them
+    come from the YAML; only the groups in ``OPTIONAL_GROUPS`` may be
+    absent, and their rows are zero.
+    """
+
+    def __init__(self, questions, answers, answer_keys, values, percentages, group_tables=None):
+        self.questions = tuple(questions)
+        self.answers = tuple(MappingProxyType(dict(labels)) for labels in answers)
+        self.answer_keys = tuple(answer_keys)
+        self.values = _readonly(values)
+        self.percentages = _readonly(percentages)
+        # group -> ScoreTable it was read from (None if no source has it);
+        # identical sources resolve to the same ScoreTable object
+        self.group_tables = MappingProxyType(dict(group_tables or {}))
+        self.group_index = MappingProxyType({group: g for g, group in enumerate(GROUPS)})
+        self.question_index = MappingProxyType({question: q for q, question in enumerate(questions)})
+        # label -> answer column, one mapping per question
+        self.answer_index = tuple(
+            MappingProxyType({label: self.answer_keys.index(key) for label, key in labels.items()})
+            for labels in self.answers
+        )
+        # answer column -> label, the inverse of answer_index
+        self.answer_label = tuple(
+            MappingProxyType({a: label for label, a in index.items()})
+            for index in self.answer_index
+        )
+        self._question_range = _readonly(np.arange(len(questions)))
+        self._frozen = True
+
+    def __reduce__(self):
+        return (type(self), (
+            self.questions,
+            [dict(labels) for labels in self.answers],
+            self.answer_keys,
+            self.values.copy(),
+            self.percentages.copy(),
+            dict(self.group_tables),
+        ))
+
+    def answer_indices(self, answers):
+        """Map ``{question: selected label}`` to an array of answer columns."""
+        return np.array(
+            [self.answer_index[q][answers[question]] for q, question in enumerate(self.questions)],
+            dtype=np.intp,
+        )
+
+    def answer_labels(self, answer_idx):
+        """Map an array of answer columns back to ``{question: label}``."""
+        return {
+            question: self.answer_label[q][int(a)]
+            for q, (question, a) in enumerate(zip(self.questions, answer_idx))
+        }
+
+    def answer_values(self, answer_idx):
+        """Value of each selected answer for every group in ``GROUPS``.
+
+        ``answer_idx`` is ``(Q,)`` or ``(N, Q)``; the result is ``(G, Q)`` or
+        ``(G, N, Q)``.
+        """
+        return self.values[:, self._question_range, np.asarray(answer_idx, dtype=np.intp)]
+
+    def group_totals(self, answer_idx):
+        """Total value of every group in ``GROUPS`` for one set of answers."""
+        return self.values[:, self._question_range, answer_idx].sum(axis=1)
+
+    def totals(self, answer_idx):
+        """Return ``(ifr_totals, vfr_totals)`` dicts keyed like app.py."""
+        totals = self.group_totals(answer_idx).tolist()
+        n = len(IFR_GROUPS)
+        return dict(zip(IFR_GROUPS, totals[:n])), dict(zip(VFR_GROUPS, totals[n:]))
+
+    def percentage(self, group, question, answer_label):
+        q = self.question_index[question]
+        return int(self.percentages[self.group_index[group], q, self.answer_index[q][answer_label]])
+
+
+class ScoreTable(_ReadOnly):
+    """One scoring source (e.g. ``adjusted_ifr.yaml``) as dense arrays.
+
+    ``values[g, q, a]`` is indexed by the table's own ``groups``,
+    ``questions`` and ``answer_keys``; ``defined[g, q, a]`` is False where
+    the source has no such answer (those cells hold 0).  ``digest``
+    identifies the source payload when the table was loaded through a
+    ``TableStore``.
+    """
+
+    def __init__(self, groups, questions, answer_keys, values, percentages, digest=None, defined=None):
+        self.groups = tuple(groups)
+        self.questions = tuple(questions)
+        self.answer_keys = tuple(answer_keys)
+        self.values = _readonly(values)
+        self.percentages = _readonly(percentages)
+        self.digest = digest
+        self.defined = _readonly(np.ones(values.shape, dtype=bool) if defined is None else defined)
+        self._frozen = True
+
+    def __reduce__(self):
+        return (type(self), (
+            self.groups,
+            self.questions,
+            self.answer_keys,
+            self.values.copy(),
+            self.percentages.copy(),
+            self.digest,
+            self.defined.copy(),
+        ))
+
+
+def _is_number(x):
+    return isinstance(x, (int, float)) and not isinstance(x, bool)
+
+
+def validate_table(scores):
+    """Return the problems in one parsed ``group -> question -> answer`` table."""
+    if not isinstance(scores, dict) or not scores:
+        return ["expected a mapping of groups"]
+    problems = []
+    for group, questions in scores.items():
+        if not isinstance(questions, dict) or not questions:
+            problems.append(f"{group}: expected a mapping of questions")
+            continue
+        for question, answers in questions.items():
+            if not isinstance(answers, dict) or not answers:
+                problems.append(f"{group} / {question}: expected a mapping of answers")
+                continue
+            for key, entry in answers.items():
+                where = f"{group} / {question} / {key}"
+                if not isinstance(key, int) or isinstance(key, bool):
+                    problems.append(f"{where}: answer key is not an integer")
+                if not isinstance(entry, dict):
+                    problems.append(f"{where}: expected a mapping with value and percentage")
+                    continue
+                for field in ("value", "percentage"):
+                    number = entry.get(field)
+                    if field not in entry:
+                        problems.append(f"{where}: missing {field}")
+                    elif not _is_number(number):
+                        problems.append(f"{where}: {field} {number!r} is not a number")
+                    elif number != int(number):
+                        problems.append(f"{where}: {field} {number!r} is not integral")
+    return problems
+
+
+def validate_labels(scores_labels):
+    """Return the problems in the parsed ``scores.yaml`` (question -> label -> key)."""
+    if not isinstance(scores_labels, dict) or not scores_labels:
+        return ["expected a mapping of questions"]
+    problems = []
+    for question, labels in scores_labels.items():
+        if not isinstance(labels, dict) or not labels:
+            problems.append(f"{question}: expected a mapping of answer labels")
+            continue
+        for label, key in labels.items():
+            if not isinstance(key, int) or isinstance(key, bool):
+                problems.append(f"{question} / {label}: answer key {key!r} is not an integer")
+    return problems
+
+
+def compile_table(scores, digest=None):
+    """Compile one parsed ``group -> question -> answer`` YAML table.
+
+    Raises ``ScoreTableError`` if ``validate_table`` finds any problem.
+    """
+    problems = validate_table(scores)
+    if problems:
+        raise ScoreTableError(problems)
+
+    groups = tuple(scores)
+    questions = tuple(dict.fromkeys(question for group in groups for question in scores[group]))
+    answer_keys = tuple(sorted({
+        key
+        for group in groups
+        for answers in scores[group].values()
+        for key in answers
+    }))
+    question_index = {question: q for q, question in enumerate(questions)}
+    key_index = {key: a for a, key in enumerate(answer_keys)}
+
+    shape = (len(groups), len(questions), len(answer_keys))
+    values = np.zeros(shape, dtype=np.int64)
+    percentages = np.zeros(shape, dtype=np.int64)
+    # Which (group, question, answer) cells the table defines; the model
+    # requires every cell it scores to be defined.
+    defined = np.zeros(shape, dtype=bool)
+
+    for g, group in enumerate(groups):
+        for question, answers in scores[group].items():
+            q = question_index[question]
+            for key, entry in answers.items():
+                a = key_index[key]
+                values[g, q, a] = entry["value"]
+                percentages[g, q, a] = entry["percentage"]
+                defined[g, q, a] = True
+
+    return ScoreTable(groups, questions, answer_keys, values, percentages, digest, defined)
+
+
+def assemble_model(ifr_table, vfr_table, scores_labels):
+    """Lay out compiled IFR/VFR tables in the question order of ``scores_labels``.
+
+    ``ifr_table`` supplies ``IFR_GROUPS`` and ``vfr_table`` supplies
+    ``VFR_GROUPS``.  Every group except ``OPTIONAL_GROUPS`` must be present
+    and define every question of ``scores_labels`` and every answer key its
+    labels map to; otherwise ``ScoreTableError`` lists what is missing.
+    """
+    problems = validate_labels(scores_labels)
+    if problems:
+        raise ScoreTableError(problems, "answer labels")
+
+    questions = tuple(scores_labels)
+    answers = tuple(dict(scores_labels[question]) for question in questions)
+    answer_keys = tuple(sorted({key for labels in answers for key in labels.values()}))
+
+    shape = (len(GROUPS), len(questions), len(answer_keys))
+    values = np.zeros(shape, dtype=np.int64)
+    percentages = np.zeros(shape, dtype=np.int64)
+    group_tables = {}
+
+    for g, group in enumerate(GROUPS):
+        side, table = ("IFR", ifr_table) if group in IFR_GROUPS else ("VFR", vfr_table)
+        if group not in table.groups:
+            if group not in OPTIONAL_GROUPS:
+                problems.append(f"{side} table: missing group {group}")
+            group_tables[group] = None
+            continue
+        tg = table.groups.index(group)
+        for question in questions:
+            tq = table.questions.index(question) if question in table.questions else None
+            if tq is None or not table.defined[tg, tq].any():
+                problems.append(f"{side} table: {group}: missing question {question!r}")
+                continue
+            missing = [
+                key for key in answer_keys
+                if key not in table.answer_keys or not table.defined[tg, tq, table.answer_keys.index(key)]
+            ]
+            if missing:
+                problems.append(
+                    f"{side} table: {group} / {question}: missing answer(s) {', '.join(map(str, missing))}"
+                )
+        if problems:
+            continue
+
+        group_tables[group] = table
+        src = np.ix_([table.questions.index(q) for q in questions],
+                     [table.answer_keys.index(key) for key in answer_keys])
+        values[g] = table.values[tg][src]
+        percentages[g] = table.percentages[tg][src]
+
+    if problems:
+        raise ScoreTableError(problems, "scoring tables")
+    return ScoringModel(questions, answers, answer_keys, values, percentages, group_tables)
+
+
+def compile_model(scores_ifr, scores_vfr, scores_labels):
+    """Build a ``ScoringModel`` from the parsed YAML tables.
+
+    ``scores_ifr`` supplies ``IFR_GROUPS``, ``scores_vfr`` supplies
+    ``VFR_GROUPS`` and ``scores_labels`` (``scores.yaml``) fixes the question
+    order and the label -> numeric answer key mapping.
+    """
+    tables = []
+    for source, scores in (("IFR table", scores_ifr), ("VFR table", scores_vfr)):
+        if tables and scores == scores_ifr:
+            tables.append(tables[0])
+            continue
+        try:
+            tables.append(compile_table(scores))
+        except ScoreTableError as e:
+            raise ScoreTableError(e.problems, source) from None
+    return assemble_model(*tables, scores_labels)
+
+
+def load_model(ifr_path, vfr_path, labels_path):
+    """Read the three YAML tables from disk and compile them."""
+    import yaml
+
+    tables = []
+    for path in (ifr_path, vfr_path, labels_path):
+        with open(path, "r") as f:
+            tables.append(yaml.safe_load(f))
+    return compile_model(*tables)
+
+
+def movement_ratios(ifr_movements, vfr_movements):
+    """IFR and VFR shares of the annual movements, vectorized over rows."""
+    ifr = np.asarray(ifr_movements)
+    vfr = np.asarray(vfr_movements)
+    total = ifr + vfr
+    has_traffic = total > 0
+    safe_total = np.where(has_traffic, total, 1)
+    ifr_ratio = np.where(has_traffic, ifr / safe_total, DEFAULT_IFR_RATIO)
+    vfr_ratio = np.where(has_traffic, vfr / safe_total, DEFAULT_VFR_RATIO)
+    return ifr_ratio, vfr_ratio
+
+
+def _exact_weights(ifr, vfr):
+    """Integer weights in the exact ratio of non-integral or very large movements.
+
+    Each movement is read as the decimal it prints as (``0.4`` is 2/5, not
+    the nearest binary float) and both are scaled by their common
+    denominator.  Weights that do not fit int64 are kept as Python integers.
+    """
+    ifr, vfr = np.broadcast_arrays(ifr, vfr)
+    w_ifr, w_vfr = [], []
+    for i, v in zip(ifr.ravel().tolist(), vfr.ravel().tolist()):
+        i, v = Fraction(str(i)), Fraction(str(v))
+        denominator = lcm(i.denominator, v.denominator)
+        w_ifr.append(int(i * denominator))
+        w_vfr.append(int(v * denominator))
+    largest = max(w_ifr + w_vfr, default=0)
+    dtype = np.int64 if largest < INT64_LIMIT else object
+    return (np.array(w_ifr, dtype=dtype).reshape(ifr.shape),
+            np.array(w_vfr, dtype=dtype).reshape(vfr.shape))
+
+
+def movement_weights(ifr_movements, vfr_movements):
+    """Integer IFR/VFR weights: the movements, or 1:3 where both are 0.
+
+    Non-integral movements become integer weights in the same exact ratio;
+    movements too large for int64 (floats, Python integers, or uint64 as
+    numpy stores ``2**63``) are kept as Python integers rather than wrapping.
+    """
+    ifr = np.asarray(ifr_movements)
+    vfr = np.asarray(vfr_movements)
+    if (ifr < 0).any() or (vfr < 0).any():
+        raise ValueError("movements must not be negative")
+    if ifr.dtype.kind == "f" or vfr.dtype.kind == "f":
+        if not (np.isfinite(ifr).all() and np.isfinite(vfr).all()):
+            raise ValueError("movements must be finite")
+    if any(a.dtype == object or (a.dtype.kind in "fu" and ((a % 1).any() or (a >= INT64_LIMIT).any()))
+           for a in (ifr, vfr)):
+        ifr, vfr = _exact_weights(ifr, vfr)
+    ifr = ifr if ifr.dtype == object else ifr.astype(np.int64)
+    vfr = vfr if vfr.dtype == object else vfr.astype(np.int64)
+    no_traffic = (ifr + vfr) == 0
+    return (np.where(no_traffic, DEFAULT_MOVEMENT_WEIGHTS[0], ifr),
+            np.where(no_traffic, DEFAULT_MOVEMENT_WEIGHTS[1], vfr))
+
+
+def div_round_half_up(numerator, denominator):
+    """``numerator / denominator`` rounded half away from zero, exactly.
+
+    Both are integer arrays and ``denominator`` is positive.
+    """
+    magnitude = (2 * np.abs(numerator) + denominator) // (2 * denominator)
+    return np.where(np.asarray(numerator) < 0, -magnitude, magnitude)
+
+
+def _exact_half_up(ifr_totals, vfr_totals, w_ifr, w_vfr, scale):
+    numerator = (ifr_totals * w_ifr + vfr_totals * w_vfr) * scale.numerator
+    denominator = (w_ifr + w_vfr) * scale.denominator
+    return div_round_half_up(numerator, denominator)
+
+
+def weighted_index(ifr_totals, vfr_totals, ifr_movements, vfr_movements, scale=NORMALISATION_RATIO):
+    """Half-up rounded ``(T_I * ifr_ratio + T_V * vfr_ratio) * scale``, computed exactly.
+
+    The ratios are ``movements / total movements`` (1:3 without traffic) and
+    ``scale`` is a ``Fraction``, so the index is one integer division with
+    no float or Decimal in between.  Totals and movements must broadcast
+    against each other; totals are integers and movements may be
+    fractional (see ``movement_weights``).
+    """
+    scale = Fraction(scale)
+    w_ifr, w_vfr = movement_weights(ifr_movements, vfr_movements)
+    ifr_totals, vfr_totals, w_ifr, w_vfr = np.broadcast_arrays(
+        np.asarray(ifr_totals, dtype=np.int64), np.asarray(vfr_totals, dtype=np.int64), w_ifr, w_vfr
+    )
+
+    index = _exact_half_up(ifr_totals, vfr_totals, w_ifr, w_vfr, scale)
+    # int64 wraps silently: redo with Python integers wherever the largest
+    # intermediate (estimated in float64, with ample margin) could overflow.
+    bound = ((np.abs(ifr_totals) * w_ifr.astype(np.float64) + np.abs(vfr_totals) * w_vfr.astype(np.float64))
+             * abs(scale.numerator) + (w_ifr.astype(np.float64) + w_vfr.astype(np.float64)) * scale.denominator) * 2
+    unsafe = bound >= INT64_LIMIT
+    if unsafe.any():
+        index[unsafe] = _exact_half_up(
+            *(a[unsafe].astype(object) for a in (ifr_totals, vfr_totals, w_ifr, w_vfr)), scale
+        ).astype(np.int64)
+    return index.astype(np.int64, copy=False)
+
+
+def scale_round_half_up(values, scale):
+    """Half-up rounded ``values * scale`` for integer ``values`` and a ``Fraction`` scale."""
+    scale = Fraction(scale)
+    values = np.asarray(values, dtype=np.int64)
+    rounded = div_round_half_up(values * scale.numerator, scale.denominator)
+    unsafe = (np.abs(values) * float(abs(scale.numerator)) + scale.denominator) * 2 >= INT64_LIMIT
+    if unsafe.any():
+        rounded[unsafe] = div_round_half_up(values[unsafe].astype(object) * scale.numerator,
+                                            scale.denominator).astype(np.int64)
+    return rounded
+
+
+class BatchScores:
+    """Scores for N assessments; row ``i`` of every array is assessment ``i``.
+
+    ``ifr_totals`` / ``vfr_totals`` are ``(N, 4)`` in ``IFR_GROUPS`` /
+    ``VFR_GROUPS`` order and ``index`` is ``(N, 4)`` in ``AERODROME_TYPES``
+    order.  ``contributions[i, g, q]`` is the value question ``q`` adds to
+    group ``GROUPS[g]``; the totals are its sums over questions.
+    """
+
+    def __init__(self, ifr_totals, vfr_totals, ifr_ratio, vfr_ratio, index, contributions=None):
+        self.ifr_totals = ifr_totals
+        self.vfr_totals = vfr_totals
+        self.ifr_ratio = ifr_ratio
+        self.vfr_ratio = vfr_ratio
+        self.index = index
+        self.contributions = contributions
+
+    def __len__(self):
+        return len(self.index)
+
+    def row(self, i):
+        """Return ``(ifr_totals, vfr_totals, result)`` dicts for one row."""
+        return (
+            dict(zip(IFR_GROUPS, self.ifr_totals[i].tolist())),
+            dict(zip(VFR_GROUPS, self.vfr_totals[i].tolist())),
+            dict(zip(AERODROME_TYPES, self.index[i].tolist())),
+        )
+
+    def index_contributions(self):
+        """``(N, 4, Q)`` share of each question in every weighted index.
+
+        ``(IFR value * IFR ratio + VFR value * VFR ratio) * NORMALISATION``
+        per question, from the kept group contributions; a row sums to the
+        index before rounding.
+        """
+        n = len(IFR_GROUPS)
+        ifr, vfr = self.contributions[:, :n], self.contributions[:, n:]
+        return (ifr * self.ifr_ratio[:, None, None] + vfr * self.vfr_ratio[:, None, None]) * NORMALISATION
+
+
+def score_batch(model, answer_idx, ifr_movements, vfr_movements):
+    """Score N assessments in one vectorized pass.
+
+    ``answer_idx`` is an ``(N, len(model.questions))`` matrix of answer
+    columns (as returned by ``model.answer_indices``); ``ifr_movements`` and
+    ``vfr_movements`` are length-N annual movement counts.  The weighted
+    index is computed exactly by ``weighted_index``; the float ratios and
+    the per-question contributions behind the totals are kept for display
+    and export.
+    """
+    answer_idx = np.asarray(answer_idx, dtype=np.intp)
+    if answer_idx.ndim != 2 or answer_idx.shape[1] != len(model.questions):
+        raise ValueError(
+            f"answer_idx must have shape (N, {len(model.questions)}), got {answer_idx.shape}"
+        )
+    # (G, N, Q) gather -> (N, G, Q) contributions, summed over questions -> (N, G)
+    contributions = model.answer_values(answer_idx).transpose(1, 0, 2)
+    totals = contributions.sum(axis=2)
+    n = len(IFR_GROUPS)
+    ifr_totals, vfr_totals = totals[:, :n], totals[:, n:]
+
+    ifr_ratio, vfr_ratio = movement_ratios(ifr_movements, vfr_movements)
+    index = weighted_index(
+        ifr_totals, vfr_totals,
+        np.asarray(ifr_movements)[:, None], np.asarray(vfr_movements)[:, None]
+    )
+    return BatchScores(ifr_totals, vfr_totals, ifr_ratio, vfr_ratio, index, contributions)
@@ -0,0 +1,76 @@
+"""Movement-mix sweeps: every aerodrome type across IFR shares and counts.
+
+Before rounding, the index of a type is linear in the IFR share ``r``::
+
+    (IFR total * r + VFR total * (1 - r)) * NORMALISATION
+
+so the whole share range and any grid of movement counts are one
+broadcast ``weighted_index`` call, and the shares where two types swap
+places in the ranking are the exact roots of the differences of those
+lines.
+"""
+from fractions import Fraction
+
+import numpy as np
+
+from .scoring import AERODROME_TYPES, weighted_index
+
+# Share steps of a default sweep (0%, 1%, ..., 100%)
+SHARE_STEPS = 100
+
+
+class MixSweep:
+    """Indices of all aerodrome types across the IFR share range.
+
+    ``shares`` are the IFR shares swept (exact ``Fraction`` objects from 0
+    to 1) and ``index[s, t]`` the index of ``AERODROME_TYPES[t]`` at
+    ``shares[s]``.  ``crossovers`` lists ``(share, higher before, higher
+    after)``: the two types whose unrounded indices cross at ``share``, the
+    one ranked higher just below it first, in increasing share order.
+    """
+
+    def __init__(self, shares, index, crossovers):
+        self.shares = shares
+        self.index = index
+        self.crossovers = crossovers
+
+
+def crossovers(ifr_totals, vfr_totals):
+    """Shares strictly between 0 and 1 where two types' unrounded indices cross.
+
+    Returns ``(share, higher before, higher after)`` tuples sorted by share;
+    parallel or identical lines never cross.
+    """
+    found = []
+    lines = [(int(v), int(i) - int(v)) for i, v in zip(ifr_totals, vfr_totals)]  # (intercept, slope)
+    for t, (intercept_t, slope_t) in enumerate(lines):
+        for u in range(t + 1, len(lines)):
+            intercept_u, slope_u = lines[u]
+            if slope_t == slope_u:
+                continue
+            share = Fraction(intercept_u - intercept_t, slope_t - slope_u)
+            if 0 < share < 1:
+                # t - u grows with the share when t has the steeper slope
+                before, after = (u, t) if slope_t > slope_u else (t, u)
+                found.append((share, AERODROME_TYPES[before], AERODROME_TYPES[after]))
+    return sorted(found, key=lambda crossover: crossover[0])
+
+
+def mix_sweep(ifr_totals, vfr_totals, steps=SHARE_STEPS):
+    """Every type's index at IFR shares ``0, 1/steps, ..., 1`` in one pass.
+
+    ``ifr_totals`` / ``vfr_totals`` are the ``(4,)`` group totals in
+    ``IFR_GROUPS`` / ``VFR_GROUPS`` order (a row of ``BatchScores``).
+    """
+    if steps < 1:
+        raise ValueError("steps must be at least 1")
+    k = np.arange(steps + 1)
+    index = weighted_index(ifr_totals, vfr_totals, k[:, None], (steps - k)[:, None])
+    return MixSweep([Fraction(int(i), steps) for i in k], index, crossovers(ifr_totals, vfr_totals))
+
+
+def movement_grid(ifr_totals, vfr_totals, ifr_movements, vfr_movements):
+    """``(I, V, 4)`` indices for every pair of IFR and VFR movement counts."""
+    ifr = np.asarray(ifr_movements)[:, None, None]
+    vfr = np.asarray(vfr_movements)[None, :, None]
+    return weighted_index(ifr_totals, vfr_totals, ifr, vfr)
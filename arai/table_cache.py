@@ -0,0 +1,138 @@
+"""Content-addressed store of compiled scoring tables.
+
+Parsing the adjusted IFR/VFR YAML with ``yaml.safe_load`` dominates a cold
+start, and several sources are often byte-identical (``adjusted_ifr.yaml``
+and ``adjusted_vfr.yaml`` today).  ``TableStore`` therefore keys everything
+by the SHA-256 of a source's bytes:
+
+* each distinct payload is parsed and compiled once per process and every
+  path with that content resolves to the same in-memory object;
+* the compiled form is pickled to ``CACHE_DIR/<digest>.<kind>.pkl``, so
+  identical sources also share one artifact on disk, and a changed file
+  simply hashes to a new artifact and falls back to the YAML once.
+
+PyYAML is imported only on a cache miss, so loading from the cache needs
+nothing beyond NumPy.
+
+Compile on demand with::
+
+    python -m arai.table_cache [adjusted_ifr.yaml adjusted_vfr.yaml scores.yaml]
+"""
+import hashlib
+import os
+import pickle
+import sys
+
+from . import scoring
+
+CACHE_DIR = ".score_cache"
+
+MAGIC = "arai-compiled-tables"
+# Bump whenever ScoreTable or the pickled layout changes
+FORMAT_VERSION = 5
+
+DEFAULT_SOURCES = ("adjusted_ifr.yaml", "adjusted_vfr.yaml", "scores.yaml")
+
+# How each kind of source is turned into its stored form
+COMPILERS = {
+    "table": scoring.compile_table,
+    "labels": lambda parsed, digest: parsed,
+}
+
+
+def file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class TableStore:
+    """Parse, compile and hold each distinct source payload exactly once."""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._objects = {}  # (kind, digest) -> compiled object
+
+    def __len__(self):
+        return len(self._objects)
+
+    def artifact_path(self, kind, digest):
+        return os.path.join(self.cache_dir, f"{digest}.{kind}.pkl")
+
+    def get(self, path, kind="table"):
+        """Return the compiled object for the file at ``path``."""
+        with open(path, "rb") as f:
+            payload = f.read()
+        digest = hashlib.sha256(payload).hexdigest()
+        key = (kind, digest)
+        obj = self._objects.get(key)
+        if obj is None:
+            obj = self._read_artifact(kind, digest)
+            if obj is None:
+                import yaml
+
+                try:
+                    obj = COMPILERS[kind](yaml.safe_load(payload), digest)
+                except scoring.ScoreTableError as e:
+                    raise scoring.ScoreTableError(e.problems, path) from None
+                self._write_artifact(kind, digest, obj)
+            self._objects[key] = obj
+        return obj
+
+    def put(self, digest, obj, kind="table"):
+        """Store an object compiled elsewhere (e.g. by the score generator) for ``digest``."""
+        self._objects[(kind, digest)] = obj
+        self._write_artifact(kind, digest, obj)
+
+    def _header(self, kind, digest):
+        return {"magic": MAGIC, "version": FORMAT_VERSION, "kind": kind, "digest": digest}
+
+    def _read_artifact(self, kind, digest):
+        try:
+            with open(self.artifact_path(kind, digest), "rb") as f:
+                if pickle.load(f) != self._header(kind, digest):
+                    return None
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+
+    def _write_artifact(self, kind, digest, obj):
+        # A cache that cannot be written (read-only checkout, permissions)
+        # is not an error; the compiled object is still used in memory.
+        path = self.artifact_path(kind, digest)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(self._header(kind, digest), f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def load_model(self, sources=DEFAULT_SOURCES):
+        """Assemble a ``ScoringModel`` from ``(ifr_path, vfr_path, labels_path)``."""
+        ifr_path, vfr_path, labels_path = sources
+        return scoring.assemble_model(
+            self.get(ifr_path), self.get(vfr_path), self.get(labels_path, "labels")
+        )
+
+
+# Process-wide store shared by every caller of load_model()
+STORE = TableStore()
+
+
+def load_model(sources=DEFAULT_SOURCES, cache_dir=CACHE_DIR):
+    """Load the compiled model, parsing YAML only for sources not seen before."""
+    store = STORE if cache_dir == STORE.cache_dir else TableStore(cache_dir)
+    return store.load_model(sources)
+
+
+if __name__ == "__main__":
+    sources = tuple(sys.argv[1:]) or DEFAULT_SOURCES
+    store = TableStore()
+    model = store.load_model(sources)
+    for group, table in model.group_tables.items():
+        where = store.artifact_path("table", table.digest) if table else "(no source)"
+        print(f"{group:10s} -> {where}")
+    print(f"{len(sources)} sources, {len(store)} distinct payloads")
@@ -0,0 +1,228 @@
+"""Indices over a monthly IFR/VFR movement time series.
+
+The answers, and so the group totals, are fixed; only the movements change
+from period to period.  ``MovementSeries`` scores every period with one
+broadcast ``weighted_index`` call and keeps running aggregates:
+
+* a rolling index from the movements summed over the trailing ``window``
+  calendar months, taken from cumulative sums;
+* a seasonal index per calendar month from the movements summed over all
+  years, kept in twelve accumulators.
+
+``extend`` (or ``append``) only scores the new periods and updates the
+aggregates from the stored sums, so adding a month never recomputes the
+history.  ``read_movements`` / ``read_movements_xlsx`` read an uploaded
+series; openpyxl is imported only for Excel files.
+"""
+import csv
+import datetime
+import re
+import zipfile
+
+import numpy as np
+
+from .scoring import weighted_index
+
+# Columns of an uploaded series (CSV or the first worksheet of an .xlsx)
+MOVEMENT_COLUMNS = ["Period", "IFR Movements", "VFR Movements"]
+
+# A period cell: a month, or a date within it
+PERIOD_PATTERN = re.compile(r"(?P<year>\d{4})-(?P<month>\d{2})(-(?P<day>\d{2}))?", re.ASCII)
+
+# Trailing months summed for the rolling index
+ROLLING_WINDOW = 12
+
+# Periods the buffers hold before they first grow
+INITIAL_CAPACITY = 64
+
+
+def period_ordinal(period):
+    """Months since year 0 of a ``"YYYY-MM"`` or ``"YYYY-MM-DD"`` string or a date."""
+    if isinstance(period, (datetime.date, datetime.datetime)):
+        return period.year * 12 + period.month - 1
+    text = str(period).strip()
+    match = PERIOD_PATTERN.fullmatch(text)
+    if not match or not 1 <= int(match["month"]) <= 12:
+        raise ValueError(f"period {text!r} is not YYYY-MM")
+    if match["day"]:
+        try:
+            datetime.date.fromisoformat(text)
+        except ValueError:
+            raise ValueError(f"period {text!r} is not a valid date") from None
+    return int(match["year"]) * 12 + int(match["month"]) - 1
+
+
+def period_label(ordinal):
+    return f"{ordinal // 12:04d}-{ordinal % 12 + 1:02d}"
+
+
+class MovementSeries:
+    """Per-period, rolling and seasonal indices of one assessment.
+
+    ``ifr_totals`` / ``vfr_totals`` are the assessment's ``(4,)`` group
+    totals (a row of ``BatchScores``).  After ``extend``, ``index[p]`` and
+    ``rolling_index[p]`` are the ``(4,)`` indices of period ``p`` alone and
+    of the trailing ``window`` months ending with it.
+    """
+
+    def __init__(self, ifr_totals, vfr_totals, window=ROLLING_WINDOW):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.ifr_totals = np.asarray(ifr_totals)
+        self.vfr_totals = np.asarray(vfr_totals)
+        self.window = window
+        self._size = 0
+        self._ordinals = np.zeros(INITIAL_CAPACITY, dtype=np.int64)
+        self._movements = np.zeros((INITIAL_CAPACITY, 2), dtype=np.int64)
+        # _cumulative[p] is the movements summed over periods before p
+        self._cumulative = np.zeros((INITIAL_CAPACITY + 1, 2), dtype=np.int64)
+        self._index = np.zeros((INITIAL_CAPACITY, len(self.ifr_totals)), dtype=np.int64)
+        self._rolling = np.zeros_like(self._index)
+        self._seasonal = np.zeros((12, 2), dtype=np.int64)
+        self._seasonal_periods = np.zeros(12, dtype=np.int64)
+
+    def __len__(self):
+        return self._size
+
+    def _score(self, movements):
+        return weighted_index(self.ifr_totals, self.vfr_totals, movements[:, :1], movements[:, 1:])
+
+    def _reserve(self, size):
+        capacity = len(self._ordinals)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ("_ordinals", "_movements", "_cumulative", "_index", "_rolling"):
+            old = getattr(self, name)
+            new = np.zeros((capacity + (name == "_cumulative"),) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def extend(self, periods, ifr_movements, vfr_movements):
+        """Add periods after the last one, in increasing order; gaps are allowed."""
+        ordinals = np.array([period_ordinal(p) for p in periods], dtype=np.int64)
+        movements = np.stack([np.asarray(ifr_movements, dtype=np.int64),
+                              np.asarray(vfr_movements, dtype=np.int64)], axis=1).reshape(len(ordinals), 2)
+        if not len(ordinals):
+            return
+        previous = self._ordinals[self._size - 1] if self._size else None
+        if (np.diff(ordinals) <= 0).any() or (previous is not None and ordinals[0] <= previous):
+            raise ValueError("periods must be added in increasing order without repeats")
+        if (movements < 0).any():
+            raise ValueError("movements must not be negative")
+
+        start, stop = self._size, self._size + len(ordinals)
+        self._reserve(stop)
+        self._ordinals[start:stop] = ordinals
+        self._movements[start:stop] = movements
+        self._cumulative[start + 1:stop + 1] = self._cumulative[start] + np.cumsum(movements, axis=0)
+        self._index[start:stop] = self._score(movements)
+
+        # Trailing window of each new period: from the first period within
+        # ``window`` months, by binary search over the stored ordinals
+        first = np.searchsorted(self._ordinals[:stop], ordinals - self.window + 1)
+        window_sums = self._cumulative[start + 1:stop + 1] - self._cumulative[first]
+        self._rolling[start:stop] = self._score(window_sums)
+
+        months = ordinals % 12
+        np.add.at(self._seasonal, months, movements)
+        np.add.at(self._seasonal_periods, months, 1)
+        self._size = stop
+
+    def append(self, period, ifr_movements, vfr_movements):
+        self.extend([period], [ifr_movements], [vfr_movements])
+
+    @property
+    def periods(self):
+        return [period_label(o) for o in self._ordinals[:self._size].tolist()]
+
+    @property
+    def movements(self):
+        """``(P, 2)`` IFR and VFR movements per period."""
+        return self._movements[:self._size]
+
+    @property
+    def index(self):
+        return self._index[:self._size]
+
+    @property
+    def rolling_index(self):
+        return self._rolling[:self._size]
+
+    def seasonal_index(self):
+        """``(months, (M, 4) indices)`` for the calendar months seen (1 = January).
+
+        Each index is computed from that month's movements summed over all
+        years.
+        """
+        months = np.flatnonzero(self._seasonal_periods)
+        return months + 1, self._score(self._seasonal[months])
+
+
+def _whole(cell):
+    # Excel stores counts as floats; CSV cells are strings
+    if isinstance(cell, float) and not cell.is_integer():
+        raise ValueError(cell)
+    return int(cell)
+
+
+def _parse_rows(header, rows):
+    missing = [c for c in MOVEMENT_COLUMNS if c not in header]
+    if missing:
+        raise ValueError(f"missing columns: {', '.join(missing)}")
+    columns = [header.index(c) for c in MOVEMENT_COLUMNS]
+    parsed = []
+    for row_number, row in enumerate(rows, start=2):
+        if all(cell in (None, "") for cell in row):
+            continue
+        period, ifr, vfr = (row[c] if c < len(row) else None for c in columns)
+        try:
+            ordinal = period_ordinal(period)
+        except ValueError as e:
+            raise ValueError(f"row {row_number}: {e}") from None
+        try:
+            ifr, vfr = _whole(ifr), _whole(vfr)
+        except (TypeError, ValueError):
+            raise ValueError(f"row {row_number}: movements must be whole numbers") from None
+        if ifr < 0 or vfr < 0:
+            raise ValueError(f"row {row_number}: movements must not be negative")
+        parsed.append((ordinal, ifr, vfr, row_number))
+
+    parsed.sort()
+    for (ordinal, *_), (next_ordinal, _, _, row_number) in zip(parsed, parsed[1:]):
+        if ordinal == next_ordinal:
+            raise ValueError(f"row {row_number}: period {period_label(ordinal)} appears twice")
+    return [period_label(o) for o, *_ in parsed], [r[1] for r in parsed], [r[2] for r in parsed]
+
+
+def read_movements(lines):
+    """Read ``(periods, ifr_movements, vfr_movements)`` from CSV ``lines``, sorted by period.
+
+    Raises ``ValueError`` naming the row of the first bad value.
+    """
+    reader = csv.reader(lines)
+    header = [cell.strip() for cell in next(reader, [])]
+    return _parse_rows(header, reader)
+
+
+def read_movements_xlsx(file):
+    """Like ``read_movements`` for the first worksheet of an .xlsx file or path."""
+    import openpyxl
+    from openpyxl.utils.exceptions import InvalidFileException
+
+    try:
+        workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    except (InvalidFileException, zipfile.BadZipFile):
+        raise ValueError("not a readable .xlsx workbook") from None
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [None if cell is None else str(cell).strip() for cell in next(rows, ())]
+        return _parse_rows(header, rows)
+    finally:
+        workbook.close()
+
+
+def movement_template():
+    """Header line of the CSV expected by ``read_movements``."""
+    return ",".join(MOVEMENT_COLUMNS) + "\n"
@@ -0,0 +1,186 @@
+"""Monte Carlo uncertainty: index distributions for uncertain inputs.
+
+Each question carries a probability over its answer columns and the
+annual IFR/VFR movements a ``(low, high)`` range.  ``simulate`` draws
+answers by inverse CDF and movements uniformly, ``CHUNK`` draws at a time
+with no Python loop per draw, adds up the group values of the drawn
+answers, scores the chunk with ``weighted_index`` and tallies the indices
+per aerodrome type into ``distribution.Distribution`` objects (counts of
+draws).  Questions with a single possible answer add a constant and are not
+sampled; the others are gathered in blocks of a few questions whose
+combined answers index one precomputed table, which cuts the number of
+gathers per chunk.
+
+Results are memoized on the inputs (model, probabilities, ranges, number of
+draws and seed); the seed is fixed, so the same inputs give the same answer.
+"""
+import functools
+
+import numpy as np
+
+from .distribution import Distribution
+from .scoring import AERODROME_TYPES, IFR_GROUPS, weighted_index
+
+# Draws per simulation by default, and per vectorized chunk
+DRAWS = 100_000
+CHUNK = 65_536
+
+# Largest number of answer combinations in one block table
+BLOCK_ROWS = 125
+
+# Simulations kept in the process-wide memo
+SIMULATION_CACHE_SIZE = 32
+
+# Width of the confidence band, in percent
+CONFIDENCE = 95
+
+
+class Simulation:
+    """Monte Carlo index distributions, one ``Distribution`` per aerodrome type.
+
+    ``distributions[type].counts`` are numbers of draws; ``mean`` is the
+    ``(4,)`` mean index in ``AERODROME_TYPES`` order.
+    """
+
+    def __init__(self, draws, distributions, mean):
+        self.draws = draws
+        self.distributions = distributions
+        self.mean = mean
+
+    def band(self, aerodrome_type, confidence=CONFIDENCE):
+        """Central ``confidence`` percent interval of the index, as ``(low, high)``."""
+        tail = (100 - confidence) / 2
+        distribution = self.distributions[aerodrome_type]
+        return distribution.percentile(tail), distribution.percentile(100 - tail)
+
+
+def answer_probabilities(model, answer_idx, alternatives=None):
+    """``(Q, A)`` probabilities for point answers with some questions disputed.
+
+    ``alternatives`` maps a question index to ``(answer column,
+    probability)``: that alternative gets the probability and the answer in
+    ``answer_idx`` keeps the rest.
+    """
+    probabilities = np.zeros(model.values.shape[1:])
+    probabilities[np.arange(len(answer_idx)), answer_idx] = 1.0
+    for q, (a, p) in (alternatives or {}).items():
+        probabilities[q, answer_idx[q]] -= p
+        probabilities[q, a] += p
+    return probabilities
+
+
+def _thresholds(probabilities):
+    """Inverse-CDF thresholds: answer ``a`` is drawn when ``a`` thresholds are <= u.
+
+    Answers with zero probability at the end of a row can never be drawn,
+    whatever the rounding of the cumulative sum.
+    """
+    cdf = np.cumsum(probabilities, axis=1)
+    remaining = cdf[:, -1:] - cdf
+    return np.where(remaining[:, :-1] > 0, cdf[:, :-1] / cdf[:, -1:], 2.0)
+
+
+def _blocks(table, questions):
+    """Split ``questions`` into blocks, each with a table of its summed values.
+
+    Returns ``[(questions, block table)]``; row ``code`` of a block table is
+    the total of every group for the answers ``code`` encodes, one base-A
+    digit per question (first question most significant).
+    """
+    n_answers = table.shape[1]
+    blocks = []
+    size = max(1, int(np.log(BLOCK_ROWS) // np.log(n_answers)))
+    for start in range(0, len(questions), size):
+        block = questions[start:start + size]
+        combined = np.zeros((1, table.shape[2]), dtype=table.dtype)
+        for q in block:
+            combined = (combined[:, None, :] + table[q][None, :, :]).reshape(-1, table.shape[2])
+        blocks.append((block, combined))
+    return blocks
+
+
+def _tally(tallies, t, values):
+    """Add ``values`` to the histogram ``tallies[t] = (lowest value, counts)``."""
+    low = int(values.min())
+    counts = np.bincount(values - low)
+    if tallies[t] is not None:
+        old_low, old_counts = tallies[t]
+        new_low = min(low, old_low)
+        merged = np.zeros(max(low + len(counts), old_low + len(old_counts)) - new_low, dtype=np.int64)
+        merged[old_low - new_low:old_low - new_low + len(old_counts)] += old_counts
+        merged[low - new_low:low - new_low + len(counts)] += counts
+        low, counts = new_low, merged
+    tallies[t] = (low, counts)
+
+
+@functools.lru_cache(maxsize=SIMULATION_CACHE_SIZE)
+def _simulate(model, probabilities, ifr_range, vfr_range, draws, seed):
+    probabilities = np.array(probabilities)
+    # (Q, A, G): every group's value of each answer
+    table = model.values.transpose(1, 2, 0)
+    possible = probabilities > 0
+    certain = possible.sum(axis=1) == 1
+    fixed = table[certain].reshape(-1, table.shape[2])[possible[certain].ravel()].sum(axis=0)
+    uncertain = np.flatnonzero(~certain)
+    thresholds = dict(zip(uncertain.tolist(), _thresholds(probabilities[uncertain]).tolist()))
+    blocks = _blocks(table, uncertain.tolist())
+    n_answers = table.shape[1]
+    n = len(IFR_GROUPS)
+
+    rng = np.random.default_rng(seed)
+    tallies = [None] * len(AERODROME_TYPES)
+    index_sum = np.zeros(len(AERODROME_TYPES), dtype=np.int64)
+    for start in range(0, draws, CHUNK):
+        size = min(CHUNK, draws - start)
+        u = iter(rng.random((len(uncertain), size)))
+        totals = np.broadcast_to(fixed, (size, len(fixed))).copy()
+        for block, combined in blocks:
+            code = np.zeros(size, dtype=np.intp)
+            for q in block:
+                draw = next(u)
+                code *= n_answers
+                for threshold in thresholds[q]:
+                    code += draw >= threshold
+            totals += combined[code]
+        ifr = rng.integers(ifr_range[0], ifr_range[1], size, endpoint=True)
+        vfr = rng.integers(vfr_range[0], vfr_range[1], size, endpoint=True)
+        index = weighted_index(totals[:, :n], totals[:, n:], ifr[:, None], vfr[:, None])
+        index_sum += index.sum(axis=0)
+        for t in range(len(AERODROME_TYPES)):
+            _tally(tallies, t, index[:, t])
+
+    distributions = {}
+    for aerodrome, (low, counts) in zip(AERODROME_TYPES, tallies):
+        values = np.flatnonzero(counts)
+        distributions[aerodrome] = Distribution(values + low, counts[values])
+    return Simulation(draws, distributions, index_sum / draws)
+
+
+def simulate(model, probabilities, ifr_range, vfr_range, draws=DRAWS, seed=0):
+    """Monte Carlo distribution of every weighted index.
+
+    ``probabilities`` is a ``(Q, A)`` array of answer probabilities (rows
+    are normalised; answers a question does not offer must have none) and
+    ``ifr_range`` / ``vfr_range`` are inclusive ``(low, high)`` movement
+    ranges drawn uniformly.  Returns a memoized ``Simulation``.
+    """
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    if probabilities.shape != model.values.shape[1:]:
+        raise ValueError(f"probabilities must have shape {model.values.shape[1:]}, got {probabilities.shape}")
+    if not (probabilities >= 0).all():
+        raise ValueError("probabilities must be non-negative numbers")
+    row_sums = probabilities.sum(axis=1)
+    for q, labels in enumerate(model.answer_label):
+        if row_sums[q] <= 0:
+            raise ValueError(f"{model.questions[q]!r}: probabilities sum to zero")
+        if any(probabilities[q, a] > 0 for a in range(probabilities.shape[1]) if a not in labels):
+            raise ValueError(f"{model.questions[q]!r}: probability on an answer the question does not offer")
+    ranges = []
+    for name, (low, high) in (("IFR", ifr_range), ("VFR", vfr_range)):
+        if not 0 <= low <= high:
+            raise ValueError(f"{name} movement range must satisfy 0 <= low <= high, got ({low}, {high})")
+        ranges.append((int(low), int(high)))
+    if draws < 1:
+        raise ValueError("draws must be at least 1")
+    key = tuple(map(tuple, (probabilities / row_sums[:, None]).tolist()))
+    return _simulate(model, key, *ranges, int(draws), seed)
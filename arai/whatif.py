@@ -0,0 +1,77 @@
+"""What-if analysis: how far each alternative answer would move the index.
+
+Changing question ``q`` from its current answer to answer column ``a``
+changes every group total by ``values[g, q, a] - values[g, q, current]``
+and leaves the other questions alone, so all ``Q x A`` single-answer
+changes can be scored at once from the base totals.  ``sensitivity``
+returns the resulting ``(Q, A, 4)`` matrix of weighted indices per
+aerodrome type, computed exactly by ``weighted_index`` in one pass.
+"""
+import numpy as np
+
+from .scoring import AERODROME_TYPES, IFR_GROUPS, weighted_index
+
+
+class Sensitivity:
+    """Weighted indices for every single-answer change to one assessment.
+
+    ``index[q, a, t]`` is the index of ``AERODROME_TYPES[t]`` if question
+    ``q`` were answered with answer column ``a`` and everything else kept;
+    ``delta`` is the same minus ``base``, the ``(4,)`` index as answered.
+    ``available[q, a]`` is False for answer columns the question does not
+    offer; their rows in ``index`` and ``delta`` are meaningless.
+    """
+
+    def __init__(self, model, answer_idx, base, index, available):
+        self.model = model
+        self.answer_idx = answer_idx
+        self.base = base
+        self.index = index
+        self.delta = index - base
+        self.available = available
+
+    def changes(self, aerodrome_type, limit=None):
+        """Alternative answers ranked by how far they move ``aerodrome_type``.
+
+        Yields ``(question, current label, alternative label, delta)`` with
+        the largest absolute change first; changes that leave the index
+        unchanged, current answers and unavailable columns are skipped.
+        Ties keep question and answer order.
+        """
+        t = AERODROME_TYPES.index(aerodrome_type)
+        delta = self.delta[:, :, t]
+        candidates = self.available & (delta != 0)
+        q, a = np.nonzero(candidates)
+        order = np.argsort(-np.abs(delta[q, a]), kind="stable")[:limit]
+        model = self.model
+        for i in order.tolist():
+            question, answer = int(q[i]), int(a[i])
+            yield (
+                model.questions[question],
+                model.answer_label[question][int(self.answer_idx[question])],
+                model.answer_label[question][answer],
+                int(delta[question, answer]),
+            )
+
+
+def sensitivity(model, answer_idx, ifr_movements, vfr_movements):
+    """Score every single-answer change to one assessment in one pass.
+
+    ``answer_idx`` is the ``(Q,)`` array of current answer columns (as
+    returned by ``model.answer_indices``); the movements are scalars.
+    """
+    answer_idx = np.asarray(answer_idx, dtype=np.intp)
+    if answer_idx.shape != (len(model.questions),):
+        raise ValueError(f"answer_idx must have shape ({len(model.questions)},), got {answer_idx.shape}")
+    current = model.answer_values(answer_idx)                       # (G, Q)
+    # Totals with question q switched to answer a: (G, Q, A) -> (Q, A, G)
+    totals = current.sum(axis=1)[:, None, None] + model.values - current[:, :, None]
+    totals = totals.transpose(1, 2, 0)
+    n = len(IFR_GROUPS)
+    index = weighted_index(totals[..., :n], totals[..., n:], ifr_movements, vfr_movements)
+
+    base = index[0, answer_idx[0]].copy()
+    available = np.zeros(index.shape[:2], dtype=bool)
+    for q, labels in enumerate(model.answer_label):
+        available[q, list(labels)] = True
+    return Sensitivity(model, answer_idx, base, index, available)
@@ -0,0 +1,87 @@
+"""Reruns and server CPU to complete one assessment, live vs batch entry.
+
+Drives the app headless with Streamlit's AppTest: every one of the 20
+questions gets a new answer, first in the default live mode (each answer
+reruns its own question fragment plus the results/export/diagnostics
+fragments) and then in batch mode (answers collected in a form, scored once
+on submit).  Counts come from the app's own instrumentation.
+
+Run from the repository root:  python benchmarks/bench_assessment_reruns.py
+"""
+import os
+import sys
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from instrumentation import METRICS_KEY  # noqa: E402
+
+# selectbox[0] is the airport; the 20 questions follow it
+ANSWER = 3
+
+
+def snapshot(at):
+    metrics = at.session_state[METRICS_KEY]
+    return metrics["reruns"], metrics["fragment_runs"], metrics["cpu"]
+
+
+def weighted_index(at):
+    cell = next(m.value for m in at.markdown if 'class="highlight"' in m.value)
+    return int(cell.split('class="highlight">')[1].split("<")[0])
+
+
+def fill(at, batch):
+    at.run()
+    if batch:
+        at.toggle(key="batch_mode").set_value(True).run()
+    reruns = fragment_runs = cpu = 0
+    if batch:
+        before = snapshot(at)
+        for i in range(1, len(at.selectbox)):
+            at.selectbox[i].select_index(ANSWER)
+        at.button[0].click().run()
+        after = snapshot(at)
+        reruns, fragment_runs, cpu = (b - a for a, b in zip(before, after))
+    else:
+        chosen = {}
+        for i in range(1, 21):
+            # After a fragment-only rerun AppTest's element tree holds just
+            # the fragments that ran and would send defaults for every other
+            # widget. Re-apply the answers so far (as the browser would) and
+            # restore the tree with an unmeasured full run.
+            for key, value in chosen.items():
+                at.session_state[key] = value
+            at.run()
+            before = snapshot(at)
+            box = at.selectbox[i]
+            box.select_index(ANSWER).run()
+            chosen[box.key] = box.options[ANSWER]
+            after = snapshot(at)
+            reruns, fragment_runs, cpu = (
+                total + b - a for total, a, b in zip((reruns, fragment_runs, cpu), before, after)
+            )
+        interaction = at.session_state[METRICS_KEY]["interactions"][-1]
+        print(f"last interaction: {interaction['trigger']!r} ran "
+              + ", ".join(f"{name} ({ms} ms)" for name, ms in interaction["fragments"]))
+        for key, value in chosen.items():
+            at.session_state[key] = value
+        at.run()
+    return reruns, fragment_runs, cpu * 1e3, weighted_index(at)
+
+
+def main():
+    os.chdir(ROOT)
+    results = {}
+    for mode, batch in (("live", False), ("batch", True)):
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+        results[mode] = fill(at, batch)
+        reruns, fragment_runs, cpu, index = results[mode]
+        print(f"{mode:6s} {reruns:3d} full reruns {fragment_runs:4d} fragment runs "
+              f"{cpu:8.1f} ms server CPU  (index {index})")
+    assert results["live"][3] == results["batch"][3], "modes disagree on the result"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Rescore a whole portfolio with score_batch vs one app-style pass per row.
+
+Every entry in airports.yaml gets a random assessment; the portfolio is then
+repeated up to ``--rows`` rows.  Results are checked against the Decimal
+rounding used inline in app.py before timing.
+
+Run from the repository root:  python benchmarks/bench_batch.py
+"""
+import argparse
+import os
+import sys
+import time
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+import yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from arai.scoring import AERODROME_TYPES, NORMALISATION, load_model, score_batch  # noqa: E402
+
+
+def per_row(model, answer_idx, ifr_value, vfr_value):
+    """One assessment scored the way app.py does it on each rerun."""
+    ifr_totals, vfr_totals = model.totals(answer_idx)
+    total_value = ifr_value + vfr_value
+    ifr_ratio = ifr_value / total_value if total_value > 0 else 0.25
+    vfr_ratio = vfr_value / total_value if total_value > 0 else 0.75
+    return {
+        new_key: int(Decimal(((v1 * ifr_ratio) + (v2 * vfr_ratio)) * NORMALISATION)
+                     .quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+        for new_key, (v1, v2) in zip(AERODROME_TYPES, zip(ifr_totals.values(), vfr_totals.values()))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    model = load_model(*(os.path.join(ROOT, name) for name in
+                         ("adjusted_ifr.yaml", "adjusted_vfr.yaml", "scores.yaml")))
+    with open(os.path.join(ROOT, "airports.yaml"), "r") as f:
+        airports = yaml.safe_load(f)
+
+    rng = np.random.default_rng(0)
+    n = max(args.rows, len(airports))
+    answer_idx = rng.integers(0, len(model.answer_keys), size=(n, len(model.questions)))
+    ifr = rng.integers(0, 50_000, size=n)
+    vfr = rng.integers(0, 50_000, size=n)
+    ifr[:10] = 0
+    vfr[:5] = 0  # a few rows without traffic exercise the default split
+
+    start = time.perf_counter()
+    scores = score_batch(model, answer_idx, ifr, vfr)
+    batch_time = time.perf_counter() - start
+
+    check = min(n, 20_000)
+    start = time.perf_counter()
+    for i in range(check):
+        expected = per_row(model, answer_idx[i], int(ifr[i]), int(vfr[i]))
+        assert scores.row(i)[2] == expected, (i, scores.row(i)[2], expected)
+    loop_time = (time.perf_counter() - start) / check * n
+
+    print(f"{len(airports)} aerodromes in airports.yaml, scored {n} rows")
+    print(f"identical indices for the first {check} rows")
+    print(f"score_batch : {batch_time * 1e3:9.1f} ms total, {batch_time / n * 1e6:6.2f} us / row")
+    print(f"per-row loop: {loop_time * 1e3:9.1f} ms total (extrapolated), {loop_time / n * 1e6:6.2f} us / row")
+
+
+if __name__ == "__main__":
+    main()
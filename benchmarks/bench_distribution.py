@@ -0,0 +1,87 @@
+"""Exact score distribution: check against enumeration, then time it.
+
+The first ``--questions`` questions (5**8 = 390,625 combinations by
+default) are enumerated with ``score_batch`` and the convolved group-total
+and index distributions, percentiles and ranks must match exactly.  The
+full tables (5**20 combinations) are then only timed.
+
+Run from the repository root:  python benchmarks/bench_distribution.py
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from arai import distribution, table_cache  # noqa: E402
+from arai.scoring import AERODROME_TYPES, ScoringModel, score_batch  # noqa: E402
+
+MOVEMENTS = [(0, 0), (12345, 54321), (7, 0), (10000, 20000)]
+
+
+def truncated(model, questions):
+    """``model`` restricted to its first ``questions`` questions."""
+    return ScoringModel(
+        model.questions[:questions], [dict(labels) for labels in model.answers[:questions]],
+        model.answer_keys, model.values[:, :questions].copy(), model.percentages[:, :questions].copy()
+    )
+
+
+def same(dist, scores):
+    values, counts = np.unique(scores, return_counts=True)
+    return np.array_equal(dist.values, values) and np.array_equal(dist.counts, counts)
+
+
+def check(model):
+    n_answers = [len(labels) for labels in model.answer_label]
+    combos = np.array(list(itertools.product(*(list(labels) for labels in model.answer_label))))
+    for ifr, vfr in MOVEMENTS:
+        scores = score_batch(model, combos, [ifr] * len(combos), [vfr] * len(combos))
+        ordered = np.sort(scores.index, axis=0)
+        for t, aerodrome in enumerate(AERODROME_TYPES):
+            joint = distribution.JointDistribution(model, aerodrome)
+            dist = joint.index_distribution(ifr, vfr)
+            assert dist.total == np.prod(n_answers)
+            assert same(dist, scores.index[:, t]), (aerodrome, ifr, vfr)
+            assert same(joint.ifr_distribution(), scores.ifr_totals[:, t])
+            assert same(joint.vfr_distribution(), scores.vfr_totals[:, t])
+            for p in (0, 5, 25, 50, 75, 95, 100):
+                assert dist.percentile(p) == ordered[max(-(-p * len(combos) // 100) - 1, 0), t]
+            index = scores.index[:, t]
+            score = int(np.median(index))
+            expected = ((index < score).mean() + (index == score).mean() / 2) * 100
+            assert abs(dist.rank(score) - expected) < 1e-9
+    return len(combos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=8)
+    args = parser.parse_args()
+    os.chdir(ROOT)
+    model = table_cache.load_model()
+
+    start = time.perf_counter()
+    combos = check(truncated(model, args.questions))
+    print(f"{args.questions} questions: distributions match enumeration of {combos:,} combinations "
+          f"({time.perf_counter() - start:.1f} s)")
+
+    start = time.perf_counter()
+    joints = distribution.joint_distributions(model)
+    print(f"joint grids, all types : {(time.perf_counter() - start) * 1e3:8.2f} ms "
+          + ", ".join(f"{k} {v.counts.shape}" for k, v in joints.items()))
+    for ifr, vfr in MOVEMENTS:
+        start = time.perf_counter()
+        dists = [joints[aerodrome].index_distribution(ifr, vfr) for aerodrome in AERODROME_TYPES]
+        elapsed = (time.perf_counter() - start) * 1e3
+        print(f"index, {ifr:>5}/{vfr:<5} IFR/VFR : {elapsed:8.2f} ms for 4 types, "
+              f"{dists[0].total:,} combinations, ATC median {dists[1].percentile(50)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Cost of the Excel export: first build, memoized repeat, and LRU bound.
+
+Also checks that the direct xlsxwriter export holds the same cells as the
+previous pandas ``to_excel`` build, and that ``ReportWriter`` keeps memory
+flat while streaming many rows.
+
+Run from the repository root:  python benchmarks/bench_export.py
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from io import BytesIO
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from arai import export, table_cache  # noqa: E402
+from arai.report import ReportWriter  # noqa: E402
+from arai.scoring import (  # noqa: E402
+    AERODROME_TYPES, GROUPS, IFR_GROUPS, NORMALISATION, VFR_GROUPS, score_batch
+)
+
+
+def pandas_workbook(model, airport, answer_idx, ifr_value, vfr_value, selected):
+    """The export as built before, with one DataFrame per sheet.
+
+    The Contributions sheet is rebuilt from the tables here, independently
+    of the contributions ``score_batch`` keeps.
+    """
+    import pandas as pd
+
+    answers = model.answer_labels(answer_idx)
+    scores = score_batch(model, [answer_idx], [ifr_value], [vfr_value])
+    ifr_totals, vfr_totals, result = scores.row(0)
+    sheets = {
+        "Summary": pd.DataFrame({
+            "Identifier": [airport],
+            "IFR Value": [ifr_value],
+            "VFR Value": [vfr_value],
+            "IFR Ratio": [float(scores.ifr_ratio[0])],
+            "VFR Ratio": [float(scores.vfr_ratio[0])],
+            "Selected Aerodrome": [selected],
+            "Selected Index": [result[selected]]
+        }),
+        "Questions": pd.DataFrame(list(answers.items()), columns=["Question", "Selected Answer"]),
+        "IFR Totals": pd.DataFrame(list(ifr_totals.items()), columns=["IFR Group", "IFR Total"]),
+        "VFR Totals": pd.DataFrame(list(vfr_totals.items()), columns=["VFR Group", "VFR Total"]),
+        "Weighted Results": pd.DataFrame(list(result.items()), columns=["Aerodrome Type", "Weighted Index"]),
+    }
+    values = pd.DataFrame(model.answer_values(answer_idx).T, columns=list(GROUPS))
+    shares = pd.DataFrame({
+        f"{aerodrome} Index": (values[ifr] * scores.ifr_ratio[0] + values[vfr] * scores.vfr_ratio[0]) * NORMALISATION
+        for aerodrome, ifr, vfr in zip(AERODROME_TYPES, IFR_GROUPS, VFR_GROUPS)
+    })
+    questions = sheets["Questions"]
+    sheets["Contributions"] = pd.concat([questions, values, shares], axis=1)
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
+        for name, df in sheets.items():
+            df.to_excel(writer, index=False, sheet_name=name)
+    return output.getvalue()
+
+
+def cells(data):
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(BytesIO(data))
+    return {ws.title: [list(row) for row in ws.iter_rows(values_only=True)] for ws in workbook}
+
+
+def stream_rows(rows, columns=8):
+    """Write ``rows`` rows to a temporary file; returns (ms, peak traced KiB)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tracemalloc.start()
+        start = time.perf_counter()
+        with ReportWriter(os.path.join(tmp, "portfolio.xlsx")) as writer:
+            writer.add_sheet("Rows", [f"Column {c}" for c in range(columns)])
+            for r in range(rows):
+                writer.write_row("Rows", [f"Aerodrome {r}"] + [r * c for c in range(1, columns)])
+        elapsed = (time.perf_counter() - start) * 1e3
+        peak = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1e3
+
+
+def import_ms(module):
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(out.stdout) * 1e3
+
+
+def main():
+    os.chdir(ROOT)
+    print(f"import pandas    : {import_ms('pandas'):8.1f} ms (no longer paid by the export)")
+    print(f"import export    : {import_ms('arai.export'):8.1f} ms")
+    model = table_cache.load_model()
+    rng = np.random.default_rng(0)
+
+    def key(i):
+        answer_idx = tuple(rng.integers(0, len(model.answer_keys), len(model.questions)).tolist())
+        return (model, f"Aerodrome {i}", answer_idx, 10000 + i, 20000, "ATC")
+
+    timed(export.assessment_workbook, *key(-1))  # first call pays the xlsxwriter import
+    timed(pandas_workbook, *key(-1))
+
+    checked = [key(i) for i in range(1000, 1010)]
+    same = all(cells(export.assessment_workbook(*k)) == cells(pandas_workbook(*k)) for k in checked)
+    print(f"same cells as pandas export: {same} ({len(checked)} assessments)")
+    export.assessment_workbook.cache_clear()
+
+    keys = [key(i) for i in range(20)]
+    legacy = [timed(pandas_workbook, *k) for k in keys]
+    cold = [timed(export.assessment_workbook, *k) for k in keys]
+    print(f"pandas build     : {np.median(legacy):8.2f} ms (median of {len(keys)})")
+    warm = [timed(export.assessment_workbook, *k) for k in keys]
+    print(f"build workbook   : {np.median(cold):8.2f} ms (median of {len(keys)})")
+    print(f"memoized repeat  : {np.median(warm) * 1e3:8.2f} us")
+
+    for i in range(3 * export.EXPORT_CACHE_SIZE):
+        export.assessment_workbook(*key(100 + i))
+    info = export.assessment_workbook.cache_info()
+    print(f"after {3 * export.EXPORT_CACHE_SIZE} more assessments: "
+          f"{info.currsize} cached (maxsize {info.maxsize})")
+
+    for rows in (1_000, 10_000, 30_000):
+        elapsed, peak = stream_rows(rows)
+        print(f"stream {rows:>7,} rows: {elapsed:8.1f} ms, peak {peak:8.1f} KiB traced")
+
+
+if __name__ == "__main__":
+    main()
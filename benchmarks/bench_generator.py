@@ -0,0 +1,242 @@
+"""Score generator: one read-only pass vs one pd.read_excel call per sheet.
+
+Builds a synthetic workbook shaped like ``ACE Word Pictures.xlsx`` (VFR and
+IFR base sheets, six adjustment sheets of 20 questions x 5 answers, plus
+word-picture text sheets), then times the previous v3 script's pandas
+pipeline against ``score_generator.generate_all`` and checks both write the
+same YAML.
+
+Also times ``score_generator.regenerate`` from scratch, with nothing changed
+and after editing one adjustment sheet.
+
+Run from the repository root:  python benchmarks/bench_generator.py [--text-rows N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import openpyxl
+import yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import score_generator  # noqa: E402
+
+ADJUSTMENT_SHEETS = ["ATC-I", "ATC-V", "AFIS-I", "AFIS-V", "UNICOM-I", "UNICOM-V"]
+
+
+def build_workbook(path, questions, text_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    header = ["Category", "1", "2", "3", "4", "5"]
+
+    for name in ("VFR", "IFR"):
+        ws = workbook.create_sheet(name)
+        ws.append(header)
+        for question in questions:
+            ws.append([question] + [int(v) for v in np.arange(10, 60, 10) + rng.integers(-3, 4, 5)])
+
+    for name in ADJUSTMENT_SHEETS:
+        ws = workbook.create_sheet(name)
+        ws.append(header)
+        for q, question in enumerate(questions):
+            # Mix numeric percentages, percentage text and blanks like the real sheets
+            cells = [None, 0]
+            for pct in rng.choice([-30, -20, -10, 0, 10, 20], 3):
+                cells.append(f"{pct}%" if q % 4 == 0 else float(pct) / 100)
+            ws.append([question.replace(" ", "\n", 1) if q % 7 == 0 else question] + cells)
+            for cell in ws[ws.max_row][1:]:
+                if isinstance(cell.value, float):
+                    cell.number_format = "0%"
+
+    # Word-picture sheets: descriptive text the generator never reads
+    for name in ("Word Pictures IFR", "Word Pictures VFR"):
+        ws = workbook.create_sheet(name)
+        for r in range(text_rows):
+            ws.append([f"Row {r}"] + [f"Description of answer {a} for row {r} " * 3 for a in range(1, 6)])
+
+    workbook.save(path)
+
+
+def legacy_generate(excel_file, ifrs_sheet, atc_sheets, read_excel=None):
+    """``generate yaml for scores v3.py`` as it was, one read_excel per sheet.
+
+    ``read_excel`` replaces ``pd.read_excel`` to time the conversions alone.
+    """
+    import pandas as pd
+
+    read_excel = read_excel or pd.read_excel
+
+    # applymap was renamed to DataFrame.map in pandas 2.1 and removed in 3.0
+    def applymap(df, func):
+        return df.map(func) if hasattr(df, "map") else df.applymap(func)
+
+    ifrs_df = read_excel(excel_file, sheet_name=ifrs_sheet, usecols="A:F", nrows=20)
+    ifrs_df.columns = [str(c).strip() for c in ifrs_df.columns]
+    ifrs_df.set_index(ifrs_df.columns[0], inplace=True)
+    ifrs_df.columns = range(1, len(ifrs_df.columns) + 1)
+
+    def clean_questions(s):
+        return str(s).strip().replace("\n", " ").replace("\r", " ")
+
+    ifrs_df.index = ifrs_df.index.map(clean_questions)
+    ifrs_df = ifrs_df.apply(pd.to_numeric, errors='coerce').fillna(0)
+
+    def read_atc_sheet(sheet_name):
+        df = read_excel(excel_file, sheet_name=sheet_name, usecols="A:F", nrows=20)
+        df.columns = [str(c).strip() for c in df.columns]
+        df.set_index(df.columns[0], inplace=True)
+        df.index = df.index.map(clean_questions)
+
+        if sheet_name in ("IFR", "VFR"):
+            def pct_to_mult(x):
+                if pd.isna(x):
+                    return 1.0
+                try:
+                    val = float(str(x).replace("%", ""))
+                    return 1.0 * (val*100) / 100.0
+                except:  # noqa: E722
+                    return 1.0
+
+            df_mult = applymap(df, pct_to_mult)
+            df_mult.columns = range(1, len(df.columns) + 1)
+            return df_mult
+        else:
+            def pct_to_mult_and_raw(x):
+                if pd.isna(x):
+                    return (1.0, 0.0)
+                try:
+                    if isinstance(x, str):
+                        val = float(x.replace("%", "").strip())
+                        raw = val
+                        mult = 1 + (raw / 100.0)
+                    else:
+                        raw = x * 100.0
+                        mult = 1 + x
+                    return (mult, raw)
+                except:  # noqa: E722
+                    return (1.0, 0.0)
+
+            df = applymap(df, pct_to_mult_and_raw)
+            df.columns = range(1, len(df.columns) + 1)
+            return df
+
+    adjusted_ifr = {}
+    for sheet in atc_sheets:
+        atc_mult_df = read_atc_sheet(sheet)
+        if sheet in ("IFR", "VFR"):
+            sheet_dict = {}
+            for question in atc_mult_df.index:
+                sheet_dict[question] = {}
+                for col in atc_mult_df.columns:
+                    val = atc_mult_df.loc[question, col]
+                    sheet_dict[question][col] = {"value": float(val), "percentage": 0.0}
+            adjusted_ifr[sheet] = sheet_dict
+        else:
+            common_questions = ifrs_df.index.intersection(atc_mult_df.index)
+            aligned_ifr = ifrs_df.loc[common_questions].fillna(0)
+            aligned_atc_mult = atc_mult_df.loc[common_questions]
+            sheet_dict = {}
+            for question in aligned_ifr.index:
+                sheet_dict[question] = {}
+                for col in aligned_ifr.columns:
+                    mult, raw = aligned_atc_mult.loc[question, col]
+                    sheet_dict[question][col] = {
+                        "value": int(round(aligned_ifr.loc[question, col] * mult)),
+                        "percentage": int(round(raw, 3))
+                    }
+            adjusted_ifr[sheet] = sheet_dict
+    return adjusted_ifr
+
+
+def best_of(repeat, fn, *args):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        times.append(time.perf_counter() - start)
+    return min(times) * 1e3, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--text-rows", type=int, default=500,
+                        help="rows on each word-picture sheet (default 500)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with open(os.path.join(ROOT, "scores.yaml")) as f:
+        questions = list(yaml.safe_load(f))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ACE Word Pictures.xlsx")
+        build_workbook(path, questions, args.text_rows)
+        print(f"synthetic workbook: {os.path.getsize(path) / 1024:.0f} KiB, "
+              f"{args.text_rows} text rows per word-picture sheet")
+
+        legacy = {}
+        legacy_ms = 0.0
+        for output, base_sheet in score_generator.OUTPUTS.items():
+            ms, legacy[output] = best_of(args.repeat, legacy_generate, path, base_sheet,
+                                         list(score_generator.GROUP_SHEETS))
+            legacy_ms += ms
+        new_ms, tables = best_of(args.repeat, score_generator.generate_all, path)
+
+        same = all(
+            yaml.dump(tables[output], sort_keys=False) == yaml.dump(legacy[output], sort_keys=False)
+            for output in score_generator.OUTPUTS
+        )
+        print(f"v3 script (8 read_excel per output): {legacy_ms:8.1f} ms for both outputs")
+        print(f"score_generator (one read-only pass): {new_ms:8.1f} ms for both outputs")
+        print(f"identical YAML: {same}")
+
+        # Conversions alone, as when generating many regional variants
+        import pandas as pd
+
+        names = ["IFR", "VFR"] + list(score_generator.GROUP_SHEETS)
+        frames = {name: pd.read_excel(path, sheet_name=name, usecols="A:F", nrows=20) for name in names}
+
+        def cached_read_excel(excel_file, sheet_name, **kwargs):
+            return frames[sheet_name].copy()
+
+        sheets = score_generator.read_sheets(path, names)
+        variants = 20
+        for label, convert in (
+            ("v3 script", lambda base_sheet: legacy_generate(
+                path, base_sheet, list(score_generator.GROUP_SHEETS), cached_read_excel)),
+            ("score_generator", lambda base_sheet: score_generator.generate(sheets, base_sheet)),
+        ):
+            start = time.perf_counter()
+            for _ in range(variants):
+                for base_sheet in score_generator.OUTPUTS.values():
+                    convert(base_sheet)
+            per_variant = (time.perf_counter() - start) / variants * 1e3
+            print(f"{label:>15s} conversions only: {per_variant:8.2f} ms per variant")
+
+        # Incremental regeneration into a scratch directory
+        os.chdir(tmp)
+        cache_dir = os.path.join(tmp, "cache")
+        for label, edit in (
+            ("first run", None),
+            ("nothing changed", None),
+            ("one ATC-V cell changed", ("ATC-V", "C3", 0.3)),
+        ):
+            if edit:
+                workbook = openpyxl.load_workbook(path)
+                workbook[edit[0]][edit[1]] = edit[2]
+                workbook.save(path)
+            start = time.perf_counter()
+            report = score_generator.regenerate(path, cache_dir=cache_dir)
+            elapsed = (time.perf_counter() - start) * 1e3
+            changed = sorted({group for changes in report.values() for group in changes})
+            print(f"regenerate, {label:<22s}: {elapsed:8.1f} ms, changed groups: {changed or '-'}")
+        os.chdir(ROOT)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Cold import cost of the scoring core, measured in fresh interpreters.
+
+Scripts, workers and the app only pay for what they use: ``import arai`` is
+free, scoring needs NumPy (which dominates its cold start), loading a cached model needs no YAML, and
+xlsxwriter is imported when the first workbook is written.  Each step also
+checks that Streamlit, pandas and xlsxwriter have not been loaded before
+an export is actually requested.
+
+Run from the repository root:  python benchmarks/bench_imports.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ("streamlit", "pandas", "xlsxwriter", "yaml")
+
+# (label, setup, timed statement, modules that must not be loaded afterwards)
+STEPS = [
+    ("import arai", "", "import arai", HEAVY),
+    ("import arai.scoring", "", "import arai.scoring", HEAVY),
+    ("  ... with numpy preloaded", "import numpy", "import arai.scoring", HEAVY),
+    ("arai.load_model() (cached)", "import arai.scoring, arai.table_cache",
+     "arai.load_model()", HEAVY),
+    ("import arai.export", "import arai", "import arai.export", HEAVY),
+    ("first assessment_workbook()", "import arai; m = arai.load_model()",
+     "arai.assessment_workbook(m, 'X', (0,) * len(m.questions), 1, 3, 'ATC')",
+     ("streamlit", "pandas")),
+    ("import numpy (reference)", "", "import numpy", ()),
+    ("import pandas (reference)", "", "import pandas", ()),
+    ("import streamlit (reference)", "", "import streamlit", ()),
+]
+
+SNIPPET = """
+import sys, time
+{setup}
+t = time.perf_counter()
+{stmt}
+elapsed = time.perf_counter() - t
+loaded = [m for m in {forbidden!r} if m in sys.modules]
+print(elapsed, ",".join(loaded))
+"""
+
+
+def run(setup, stmt, forbidden, repeat):
+    code = SNIPPET.format(setup=setup, stmt=stmt, forbidden=forbidden)
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True,
+                             text=True, check=True).stdout.split()
+        if len(out) > 1:
+            raise AssertionError(f"{stmt!r} loaded {out[1]}")
+        times.append(float(out[0]))
+    return statistics.median(times)
+
+
+def main(repeat=7):
+    os.chdir(ROOT)
+    # Make sure the compiled tables are cached before timing the cached load
+    subprocess.run([sys.executable, "-m", "arai.table_cache"], cwd=ROOT, capture_output=True, check=True)
+    for label, setup, stmt, forbidden in STEPS:
+        print(f"{label:<30}: {run(setup, stmt, forbidden, repeat) * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Mitigation optimizer: check against enumeration, then time it.
+
+On the first ``--questions`` questions every answer combination is scored
+with ``score_batch`` and the cheapest one meeting each target found by
+brute force; ``mitigate`` must return the same cost and answers that really
+meet the target, for default and random cost tables (some answers ruled
+out).  Solves on the full tables are then timed over a range of targets.
+
+Run from the repository root:  python benchmarks/bench_mitigation.py
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from arai import table_cache  # noqa: E402
+from arai.mitigation import distance_costs, mitigate  # noqa: E402
+from arai.scoring import AERODROME_TYPES, ScoringModel, score_batch  # noqa: E402
+
+
+def truncated(model, questions):
+    """``model`` restricted to its first ``questions`` questions."""
+    return ScoringModel(
+        model.questions[:questions], [dict(labels) for labels in model.answers[:questions]],
+        model.answer_keys, model.values[:, :questions].copy(), model.percentages[:, :questions].copy()
+    )
+
+
+def check(model, trials=20, seed=0):
+    rng = np.random.default_rng(seed)
+    n_questions, n_answers = model.values.shape[1:]
+    combos = np.array(list(itertools.product(range(n_answers), repeat=n_questions)))
+    solved = 0
+    for trial in range(trials):
+        answer_idx = rng.integers(0, n_answers, n_questions)
+        ifr, vfr = rng.integers(0, 20_000, 2).tolist()
+        if trial % 2:
+            costs = distance_costs(model, answer_idx)
+        else:
+            costs = rng.integers(0, 10, (n_questions, n_answers)).astype(np.float64)
+            costs[rng.random(costs.shape) < 0.1] = np.inf
+            costs[np.arange(n_questions), answer_idx] = 0
+        scores = score_batch(model, combos, [ifr] * len(combos), [vfr] * len(combos))
+        total_cost = costs[np.arange(n_questions), combos].sum(axis=1)
+        for t, aerodrome in enumerate(AERODROME_TYPES):
+            index = scores.index[:, t]
+            for target in np.unique(index)[::3].tolist() + [int(index.min()) - 1]:
+                plan = mitigate(model, answer_idx, aerodrome, target, ifr, vfr, costs)
+                allowed = (index <= target) & np.isfinite(total_cost)
+                if not allowed.any():
+                    assert plan is None
+                    continue
+                assert plan is not None and plan.cost == total_cost[allowed].min()
+                reached = score_batch(model, [plan.answer_idx], [ifr], [vfr]).index[0, t]
+                assert reached == plan.index <= target
+                solved += 1
+    return solved, len(combos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=7)
+    args = parser.parse_args()
+    os.chdir(ROOT)
+    model = table_cache.load_model()
+
+    start = time.perf_counter()
+    solved, combos = check(truncated(model, args.questions))
+    print(f"{args.questions} questions: {solved} solves match enumeration of {combos:,} combinations "
+          f"({time.perf_counter() - start:.1f} s)")
+
+    rng = np.random.default_rng(1)
+    answer_idx = rng.integers(0, len(model.answer_keys), len(model.questions))
+    mitigate(model, answer_idx, "ATC", 0, 10000, 20000)  # builds the cached grids
+    for aerodrome in AERODROME_TYPES:
+        targets = range(0, 200, 5)
+        start = time.perf_counter()
+        plans = [mitigate(model, answer_idx, aerodrome, target, 10000, 20000) for target in targets]
+        elapsed = (time.perf_counter() - start) * 1e3 / len(targets)
+        reachable = [plan for plan in plans if plan is not None]
+        print(f"{aerodrome:<12}: {elapsed:6.2f} ms / solve, {len(reachable)}/{len(targets)} targets reachable, "
+              f"lowest {reachable[0].index} at cost {reachable[0].cost:g}")
+
+
+if __name__ == "__main__":
+    main()
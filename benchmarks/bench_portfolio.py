@@ -0,0 +1,56 @@
+"""Portfolio export: time and peak memory against the number of aerodromes.
+
+Run from the repository root:  python benchmarks/bench_portfolio.py
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from arai import export, table_cache  # noqa: E402
+from arai.scoring import AERODROME_TYPES  # noqa: E402
+
+
+def assessments(model, count, seed=0):
+    """Generate random assessments lazily, as an uploaded CSV would be read."""
+    rng = np.random.default_rng(seed)
+    for i in range(count):
+        yield (
+            f"Aerodrome {i}",
+            tuple(rng.integers(0, len(model.answer_keys), len(model.questions)).tolist()),
+            int(rng.integers(0, 50_000)),
+            int(rng.integers(0, 50_000)),
+            AERODROME_TYPES[i % len(AERODROME_TYPES)],
+        )
+
+
+def main():
+    os.chdir(ROOT)
+    model = table_cache.load_model()
+    export.portfolio_workbook(model, assessments(model, 10))  # warm up imports
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in (100, 500, 2_000):
+            path = os.path.join(tmp, f"portfolio_{count}.xlsx")
+            start = time.perf_counter()
+            export.write_portfolio(path, model, assessments(model, count))
+            elapsed = time.perf_counter() - start
+
+            tracemalloc.start()
+            export.write_portfolio(path, model, assessments(model, count))
+            peak = tracemalloc.get_traced_memory()[1] / 1024
+            tracemalloc.stop()
+
+            print(f"{count:>6,} aerodromes ({count * (len(model.questions) + 4):>6,} rows): "
+                  f"{elapsed:6.2f} s, peak {peak:8.1f} KiB traced, "
+                  f"{os.path.getsize(path) / 1024:8.1f} KiB on disk")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Bytes sent to the browser per interaction with the app.
+
+Runs the app headless with Streamlit's AppTest and sums the serialized size
+of every ForwardMsg the script run enqueues for the websocket (deltas, page
+config, ...), for the first load and for a few typical interactions.
+
+Run from the repository root:  python benchmarks/bench_rerun_bytes.py [--app app.py]
+"""
+import argparse
+import os
+from collections import Counter
+
+from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SENT = Counter()
+_enqueue = ForwardMsgQueue.enqueue
+
+
+def _counting_enqueue(self, msg):
+    SENT["messages"] += 1
+    SENT["bytes"] += msg.ByteSize()
+    return _enqueue(self, msg)
+
+
+ForwardMsgQueue.enqueue = _counting_enqueue
+
+
+def measure(label, action):
+    SENT.clear()
+    action()
+    print(f"{label:28s} {SENT['messages']:5d} msgs {SENT['bytes'] / 1024:9.1f} KiB")
+    return SENT["bytes"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default="app.py")
+    args = parser.parse_args()
+    os.chdir(ROOT)
+
+    at = AppTest.from_file(os.path.abspath(args.app), default_timeout=60)
+    measure("first load", at.run)
+    interactions = [
+        ("change one answer", lambda: at.selectbox[1].select_index(2).run()),
+        ("change another answer", lambda: at.selectbox[15].select_index(4).run()),
+        ("change IFR movements", lambda: at.number_input[0].set_value(15000).run()),
+        ("change aerodrome type", lambda: at.radio[0].set_value("AFIS").run()),
+    ]
+    total = 0
+    for label, action in interactions:
+        # After a fragment-only rerun AppTest's element tree holds just the
+        # fragments that ran; an unmeasured full run restores the widgets.
+        at.run()
+        total += measure(label, action)
+    print(f"{'mean per interaction':28s} {'':10s} {total / len(interactions) / 1024:9.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Per-assessment latency: nested-dict group loops vs the compiled model.
+
+Run from the repository root:  python benchmarks/bench_scoring.py
+"""
+import os
+import random
+import sys
+import timeit
+
+import yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from arai.scoring import IFR_GROUPS, VFR_GROUPS, compile_model  # noqa: E402
+
+
+def load_yaml(name):
+    with open(os.path.join(ROOT, name), "r") as f:
+        return yaml.safe_load(f)
+
+
+def legacy_totals(scores_ifr, scores_vfr, scores_labels, answers):
+    """The group loops as they were written inline in app.py."""
+    out = []
+    for groups, table in ((IFR_GROUPS, scores_ifr), (VFR_GROUPS, scores_vfr)):
+        totals = {}
+        for group in groups:
+            total = 0.0
+            group_questions = table.get(group, {})
+            for question, selected_text in answers.items():
+                if question in group_questions:
+                    numeric_key = scores_labels.get(question, {}).get(selected_text)
+                    if numeric_key is not None:
+                        value_dict = group_questions[question].get(numeric_key)
+                        if isinstance(value_dict, dict):
+                            total += float(value_dict.get("value", 0))
+            totals[group] = total
+        out.append({group: round(total) for group, total in totals.items()})
+    return tuple(out)
+
+
+def main(samples=2000, number=2000):
+    scores_ifr = load_yaml("adjusted_ifr.yaml")
+    scores_vfr = load_yaml("adjusted_vfr.yaml")
+    scores_labels = load_yaml("scores.yaml")
+    model = compile_model(scores_ifr, scores_vfr, scores_labels)
+
+    rng = random.Random(0)
+    assessments = [
+        {question: rng.choice(list(labels)) for question, labels in scores_labels.items()}
+        for _ in range(samples)
+    ]
+    for answers in assessments:
+        expected = legacy_totals(scores_ifr, scores_vfr, scores_labels, answers)
+        got = model.totals(model.answer_indices(answers))
+        assert got == expected, (answers, got, expected)
+        assert all(type(v) is int for d in got for v in d.values())
+    print(f"identical totals for {samples} random assessments")
+
+    answers = assessments[0]
+    answer_idx = model.answer_indices(answers)
+    cases = {
+        "dict loops": lambda: legacy_totals(scores_ifr, scores_vfr, scores_labels, answers),
+        "compiled (labels -> totals)": lambda: model.totals(model.answer_indices(answers)),
+        "compiled (indices -> totals)": lambda: model.totals(answer_idx),
+    }
+    for name, fn in cases.items():
+        best = min(timeit.repeat(fn, number=number, repeat=5)) / number
+        print(f"{name:30s} {best * 1e6:8.1f} us / assessment")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Memory and latency of handing the scoring tables to concurrent sessions.
+
+``st.cache_data`` stores the pickled return value and unpickles a fresh copy
+on every hit, so each rerun of each session gets its own deep copy.
+``st.cache_resource`` hands every caller the same object.  This script
+simulates ``--sessions`` concurrent sessions doing ``--reruns`` reruns each
+and compares:
+
+* cache_data on the three YAML dicts (how app.py used to load them),
+* cache_data on the compiled model,
+* cache_resource on the read-only compiled model (what app.py does now).
+
+Run from the repository root:  python benchmarks/bench_sessions.py
+"""
+import argparse
+import os
+import pickle
+import sys
+import threading
+import time
+import tracemalloc
+
+import yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from arai import table_cache  # noqa: E402
+
+
+def simulate(get_tables, sessions, reruns, trace=False):
+    """Run the sessions concurrently; each holds its tables until the next rerun.
+
+    Latency and memory come from separate runs (``trace``) because
+    tracemalloc itself slows allocation-heavy code down considerably.
+    """
+    held = [None] * sessions
+    barrier = threading.Barrier(sessions)
+    latencies = []
+    lock = threading.Lock()
+
+    def session(i):
+        barrier.wait()
+        local = []
+        for _ in range(reruns):
+            start = time.perf_counter()
+            held[i] = get_tables()
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    if trace:
+        tracemalloc.start()
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+    if trace:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak
+    latencies.sort()
+    return wall, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--reruns", type=int, default=40)
+    args = parser.parse_args()
+    os.chdir(ROOT)
+
+    yaml_blobs = []
+    for name in table_cache.DEFAULT_SOURCES:
+        with open(name, "r") as f:
+            yaml_blobs.append(pickle.dumps(yaml.safe_load(f)))
+    model = table_cache.load_model()
+    model_blob = pickle.dumps(model)
+
+    cases = {
+        "cache_data, YAML dicts": lambda: [pickle.loads(blob) for blob in yaml_blobs],
+        "cache_data, compiled model": lambda: pickle.loads(model_blob),
+        "cache_resource, shared model": lambda: model,
+    }
+    print(f"{args.sessions} sessions x {args.reruns} reruns")
+    print(f"{'':30s} {'wall':>9s} {'p50/rerun':>10s} {'p99/rerun':>10s} {'peak mem':>10s}")
+    for name, get_tables in cases.items():
+        wall, p50, p99 = simulate(get_tables, args.sessions, args.reruns)
+        peak = simulate(get_tables, args.sessions, args.reruns, trace=True)
+        print(f"{name:30s} {wall * 1e3:7.1f}ms {p50 * 1e6:8.1f}us {p99 * 1e6:8.1f}us "
+              f"{peak / 2**20:8.2f}MB")
+
+
+if __name__ == "__main__":
+    main()
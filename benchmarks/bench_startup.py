@@ -0,0 +1,57 @@
+"""Time to a usable scoring model: YAML parse + compile vs the binary cache.
+
+Each path is measured in fresh interpreter processes so the figures reflect
+a cold worker (or a cleared Streamlit cache) rather than warm in-process
+reloads.
+
+Run from the repository root:  python benchmarks/bench_startup.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNIPPET = """
+import time
+import sys
+from arai import scoring, table_cache
+t = time.perf_counter()
+if {path!r} == "yaml":
+    model = scoring.load_model(*table_cache.DEFAULT_SOURCES)
+else:
+    store = table_cache.TableStore({cache_dir!r})
+    sys.modules["yaml"] = None  # any YAML parse here is a cache miss
+    model = store.load_model(table_cache.DEFAULT_SOURCES)
+print(time.perf_counter() - t)
+"""
+
+
+def run(path, cache_dir, repeat):
+    code = SNIPPET.format(path=path, cache_dir=cache_dir)
+    times = [
+        float(subprocess.check_output([sys.executable, "-c", code], cwd=ROOT, text=True))
+        for _ in range(repeat)
+    ]
+    return statistics.median(times)
+
+
+def main(repeat=7):
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    from arai import table_cache
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        table_cache.TableStore(cache_dir).load_model(table_cache.DEFAULT_SOURCES)
+        yaml_time = run("yaml", cache_dir, repeat)
+        cache_time = run("cache", cache_dir, repeat)
+
+    print(f"YAML parse + compile : {yaml_time * 1e3:8.2f} ms")
+    print(f"binary cache (hashed): {cache_time * 1e3:8.2f} ms")
+    print(f"speed-up             : {yaml_time / cache_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Movement-mix sweep vs rescoring the assessment at every movement pair.
+
+For random assessments the share sweep and a movement grid are checked
+against ``score_batch`` at the same movements, and every crossover is
+checked to be an exact root where the two types really swap places.
+
+Run from the repository root:  python benchmarks/bench_sweep.py
+"""
+import os
+import sys
+import time
+from fractions import Fraction
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from arai import table_cache  # noqa: E402
+from arai.scoring import AERODROME_TYPES, score_batch  # noqa: E402
+from arai.sweep import SHARE_STEPS, mix_sweep, movement_grid  # noqa: E402
+
+GRID = np.linspace(0, 100_000, 51).astype(int)
+
+
+def check(model, answer_idx):
+    scores = score_batch(model, [answer_idx], [1], [1])
+    ifr_totals, vfr_totals = scores.ifr_totals[0], scores.vfr_totals[0]
+    sweep = mix_sweep(ifr_totals, vfr_totals)
+    k = np.arange(SHARE_STEPS + 1)
+    rows = np.repeat([answer_idx], len(k), axis=0)
+    assert (score_batch(model, rows, k, SHARE_STEPS - k).index == sweep.index).all()
+
+    ifr, vfr = np.meshgrid(GRID[::5], GRID[::5], indexing="ij")
+    rows = np.repeat([answer_idx], ifr.size, axis=0)
+    expected = score_batch(model, rows, ifr.ravel(), vfr.ravel()).index.reshape(*ifr.shape, 4)
+    assert (movement_grid(ifr_totals, vfr_totals, GRID[::5], GRID[::5]) == expected).all()
+
+    line = lambda share, t: vfr_totals[t] + (ifr_totals[t] - vfr_totals[t]) * share  # noqa: E731
+    eps = Fraction(1, 10 ** 9)
+    for share, before, after in sweep.crossovers:
+        b, a = AERODROME_TYPES.index(before), AERODROME_TYPES.index(after)
+        assert line(share, b) == line(share, a)
+        assert line(share - eps, b) > line(share - eps, a) and line(share + eps, a) > line(share + eps, b)
+    return len(sweep.crossovers)
+
+
+def main(assessments=200):
+    os.chdir(ROOT)
+    model = table_cache.load_model()
+    rng = np.random.default_rng(0)
+    cases = rng.integers(0, len(model.answer_keys), (assessments, len(model.questions)))
+    found = sum(check(model, answer_idx) for answer_idx in cases)
+    print(f"{assessments} assessments: sweeps and grids match score_batch, {found} crossovers verified")
+
+    answer_idx = cases[0]
+    scores = score_batch(model, [answer_idx], [1], [1])
+    start = time.perf_counter()
+    mix_sweep(scores.ifr_totals[0], scores.vfr_totals[0])
+    grid = movement_grid(scores.ifr_totals[0], scores.vfr_totals[0], GRID, GRID)
+    analytic = (time.perf_counter() - start) * 1e3
+    start = time.perf_counter()
+    for ifr in GRID[:5]:
+        for vfr in GRID:
+            score_batch(model, [answer_idx], [ifr], [vfr])
+    rescored = (time.perf_counter() - start) * 1e3 / (5 * len(GRID))
+    points = SHARE_STEPS + 1 + grid.shape[0] * grid.shape[1]
+    print(f"sweep + {len(GRID)}x{len(GRID)} grid : {analytic:8.2f} ms for {points:,} points x 4 types")
+    print(f"one rescore per point  : {rescored * points:8.2f} ms (extrapolated)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Movement time series vs rescoring the assessment for every period.
+
+For random assessments and monthly series with gaps, the per-period,
+rolling and seasonal indices of ``MovementSeries`` are checked against
+``score_batch`` at the summed movements, and a series built by ``extend``
+against one built month by month with ``append``.  The CSV and Excel
+readers are checked on good files and on every kind of bad row.
+
+Run from the repository root:  python benchmarks/bench_timeseries.py
+"""
+import datetime
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from arai import table_cache  # noqa: E402
+from arai.scoring import score_batch  # noqa: E402
+from arai.timeseries import (  # noqa: E402
+    MovementSeries, movement_template, period_label, read_movements, read_movements_xlsx,
+)
+
+# (CSV body after the header, start of the expected error)
+BAD_ROWS = [
+    ("2024-123,1,2\n", "row 2: period '2024-123' is not YYYY-MM"),
+    ("2024-12abc,1,2\n", "row 2: period '2024-12abc' is not YYYY-MM"),
+    ("2024-01-99,1,2\n", "row 2: period '2024-01-99' is not a valid date"),
+    ("2024-13,1,2\n", "row 2: period '2024-13' is not YYYY-MM"),
+    ("2024-01,1,2\n2024-02,x,2\n", "row 3: movements must be whole numbers"),
+    ("2024-01,1.5,2\n", "row 2: movements must be whole numbers"),
+    ("2024-01,-1,2\n", "row 2: movements must not be negative"),
+    ("2024-01,1,2\n2024-01-15,3,4\n", "row 3: period 2024-01 appears twice"),
+]
+
+
+def xlsx(rows):
+    import openpyxl
+
+    workbook = openpyxl.Workbook()
+    for row in rows:
+        workbook.active.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def expect_error(read, source, message):
+    try:
+        read(source)
+    except ValueError as e:
+        assert str(e).startswith(message), (str(e), message)
+    else:
+        raise AssertionError(f"no error, expected {message!r}")
+
+
+def check_readers():
+    """Both readers on a valid series (unsorted, blank row, dates) and on bad rows."""
+    body = "2024-03,30,31\n,,\n2024-01-15,10,11\n2024-02,20,21\n"
+    expected = (["2024-01", "2024-02", "2024-03"], [10, 20, 30], [11, 21, 31])
+    assert read_movements(io.StringIO(movement_template() + body)) == expected
+    header = " Period , IFR Movements,VFR Movements\n"
+    assert read_movements(io.StringIO(header + body)) == expected
+    rows = [["Period", "IFR Movements", "VFR Movements"], ["2024-03", 30.0, 31],
+            [None, None, None], [datetime.date(2024, 1, 15), 10, 11], ["2024-02", 20, 21.0]]
+    assert read_movements_xlsx(xlsx(rows)) == expected
+
+    expect_error(read_movements, io.StringIO("Period,IFR Movements\n"), "missing columns: VFR Movements")
+    for body, message in BAD_ROWS:
+        expect_error(read_movements, io.StringIO(movement_template() + body), message)
+        cells = [row.split(",") for row in body.splitlines()]
+        expect_error(read_movements_xlsx, xlsx([rows[0]] + cells), message)
+    expect_error(read_movements_xlsx, io.BytesIO(b"not a workbook"), "not a readable .xlsx workbook")
+    return len(BAD_ROWS)
+
+
+def random_series(rng, periods, start=2000, gaps=True):
+    ordinals = start * 12 + np.cumsum(rng.integers(1, 3 if gaps else 2, periods))
+    movements = rng.integers(0, 5_000, (periods, 2))
+    return [period_label(o) for o in ordinals.tolist()], ordinals, movements
+
+
+def check(model, answer_idx, rng, periods=60):
+    scores = score_batch(model, [answer_idx], [1], [1])
+    labels, ordinals, movements = random_series(rng, periods)
+    series = MovementSeries(scores.ifr_totals[0], scores.vfr_totals[0])
+    series.extend(labels, movements[:, 0], movements[:, 1])
+    rows = np.repeat([answer_idx], periods, axis=0)
+    assert (score_batch(model, rows, movements[:, 0], movements[:, 1]).index == series.index).all()
+
+    window = (ordinals[None, :] <= ordinals[:, None]) & (ordinals[None, :] > ordinals[:, None] - series.window)
+    summed = window.astype(np.int64) @ movements
+    assert (score_batch(model, rows, summed[:, 0], summed[:, 1]).index == series.rolling_index).all()
+
+    months, seasonal = series.seasonal_index()
+    summed = np.array([movements[ordinals % 12 == m - 1].sum(axis=0) for m in months])
+    rows = np.repeat([answer_idx], len(months), axis=0)
+    assert (score_batch(model, rows, summed[:, 0], summed[:, 1]).index == seasonal).all()
+
+    incremental = MovementSeries(scores.ifr_totals[0], scores.vfr_totals[0])
+    for label, (ifr, vfr) in zip(labels, movements.tolist()):
+        incremental.append(label, ifr, vfr)
+    assert (incremental.rolling_index == series.rolling_index).all() and incremental.periods == series.periods
+
+
+def main(assessments=50, periods=100_000):
+    os.chdir(ROOT)
+    model = table_cache.load_model()
+    rng = np.random.default_rng(0)
+    cases = rng.integers(0, len(model.answer_keys), (assessments, len(model.questions)))
+    for answer_idx in cases:
+        check(model, answer_idx, rng)
+    print(f"{assessments} assessments: period, rolling and seasonal indices match score_batch")
+    print(f"readers: valid CSV and Excel series read alike, {check_readers()} kinds of bad row rejected")
+
+    answer_idx = cases[0]
+    scores = score_batch(model, [answer_idx], [1], [1])
+    # Consecutive months from year 1 so that every label stays YYYY-MM
+    labels, _, movements = random_series(rng, periods, start=1, gaps=False)
+    series = MovementSeries(scores.ifr_totals[0], scores.vfr_totals[0])
+    start = time.perf_counter()
+    series.extend(labels[:-1], movements[:-1, 0], movements[:-1, 1])
+    bulk = (time.perf_counter() - start) * 1e3
+    start = time.perf_counter()
+    series.append(labels[-1], *movements[-1].tolist())
+    append = (time.perf_counter() - start) * 1e3
+    series.seasonal_index()
+    print(f"extend {periods - 1:,} periods : {bulk:8.2f} ms")
+    print(f"append one month     : {append:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Monte Carlo uncertainty mode: check the sampler, then time 10**6 draws.
+
+On the first ``--questions`` questions, with random answer probabilities
+and fixed movements, the exact index probabilities are computed by
+enumerating every combination; the sampled frequencies must agree within
+``TOLERANCE`` standard errors.  ``simulate`` is then timed on the full
+tables with a few disputed questions and with every question uncertain.
+
+Run from the repository root:  python benchmarks/bench_uncertainty.py
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from arai import table_cache, uncertainty  # noqa: E402
+from arai.scoring import AERODROME_TYPES, ScoringModel, score_batch  # noqa: E402
+
+# Largest deviation accepted, in standard errors of the sampled frequency
+TOLERANCE = 5
+
+
+def truncated(model, questions):
+    """``model`` restricted to its first ``questions`` questions."""
+    return ScoringModel(
+        model.questions[:questions], [dict(labels) for labels in model.answers[:questions]],
+        model.answer_keys, model.values[:, :questions].copy(), model.percentages[:, :questions].copy()
+    )
+
+
+def check(model, draws, seed=0):
+    rng = np.random.default_rng(seed)
+    n_questions, n_answers = model.values.shape[1:]
+    probabilities = rng.random((n_questions, n_answers))
+    probabilities[probabilities < 0.3] = 0
+    probabilities[:, 0] += 0.01
+    probabilities[0] = np.eye(n_answers)[2]           # a certain question
+    probabilities /= probabilities.sum(axis=1, keepdims=True)
+    combos = np.array(list(itertools.product(range(n_answers), repeat=n_questions)))
+    weights = probabilities[np.arange(n_questions), combos].prod(axis=1)
+    scores = score_batch(model, combos, [100] * len(combos), [300] * len(combos))
+
+    simulation = uncertainty.simulate(model, probabilities, (100, 100), (300, 300), draws)
+    worst = 0.0
+    for t, aerodrome in enumerate(AERODROME_TYPES):
+        sampled = simulation.distributions[aerodrome]
+        assert set(sampled.values.tolist()) <= set(scores.index[weights > 0, t].tolist())
+        for value in np.unique(scores.index[:, t]):
+            p = weights[scores.index[:, t] == value].sum()
+            if 0 < p < 1:
+                count = sampled.counts[sampled.values == value].sum()
+                worst = max(worst, abs(count - p * draws) / np.sqrt(draws * p * (1 - p)))
+    assert worst < TOLERANCE, worst
+    return worst
+
+
+def timed(model, probabilities, draws):
+    start = time.perf_counter()
+    simulation = uncertainty.simulate(model, probabilities, (8000, 12000), (15000, 25000), draws)
+    return time.perf_counter() - start, simulation
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=6)
+    parser.add_argument("--draws", type=int, default=1_000_000)
+    args = parser.parse_args()
+    os.chdir(ROOT)
+    model = table_cache.load_model()
+
+    worst = check(truncated(model, args.questions), args.draws)
+    print(f"{args.questions} questions: sampled frequencies within {worst:.2f} standard errors of exact")
+
+    answer_idx = np.random.default_rng(1).integers(0, len(model.answer_keys), len(model.questions))
+    scenarios = {
+        "3 disputed questions": uncertainty.answer_probabilities(
+            model, answer_idx, {q: ((int(answer_idx[q]) + 1) % len(model.answer_keys), 0.4) for q in (2, 7, 11)}
+        ),
+        "every question uniform": np.full(model.values.shape[1:], 1.0),
+    }
+    for name, probabilities in scenarios.items():
+        elapsed, simulation = timed(model, probabilities, args.draws)
+        low, high = simulation.band("ATC")
+        repeat, _ = timed(model, probabilities, args.draws)
+        print(f"{name:<24}: {args.draws:,} draws in {elapsed * 1e3:7.1f} ms "
+              f"(memoized repeat {repeat * 1e6:5.1f} us), ATC mean {simulation.mean[1]:.2f}, "
+              f"95% band {low}-{high}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Sensitivity matrix vs scoring each alternative answer separately.
+
+For random assessments, every single-answer change is scored both by
+``sensitivity`` (one pass) and by one ``score_batch`` call per change, the
+way a user trying alternatives in the app triggers one rescore each.  The
+matrices are checked for equality before timing.
+
+Run from the repository root:  python benchmarks/bench_whatif.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from arai import table_cache  # noqa: E402
+from arai.scoring import score_batch  # noqa: E402
+from arai.whatif import sensitivity  # noqa: E402
+
+
+def one_by_one(model, answer_idx, ifr_value, vfr_value):
+    """Rescore every (question, answer) change with its own score_batch call."""
+    n_questions, n_answers = model.values.shape[1:]
+    index = np.empty((n_questions, n_answers, 4), dtype=np.int64)
+    for q in range(n_questions):
+        for a in range(n_answers):
+            changed = answer_idx.copy()
+            changed[q] = a
+            index[q, a] = score_batch(model, changed[None, :], [ifr_value], [vfr_value]).index[0]
+    return index
+
+
+def main(assessments=200):
+    os.chdir(ROOT)
+    model = table_cache.load_model()
+    rng = np.random.default_rng(0)
+    cases = [
+        (rng.integers(0, len(model.answer_keys), len(model.questions)), *rng.integers(0, 50_000, 2).tolist())
+        for _ in range(assessments)
+    ]
+    for case in cases[:20]:
+        assert (sensitivity(model, *case).index == one_by_one(model, *case)).all()
+
+    start = time.perf_counter()
+    for case in cases:
+        sensitivity(model, *case)
+    matrix_ms = (time.perf_counter() - start) * 1e3 / assessments
+    start = time.perf_counter()
+    for case in cases[:20]:
+        one_by_one(model, *case)
+    loop_ms = (time.perf_counter() - start) * 1e3 / 20
+
+    shape = "x".join(map(str, sensitivity(model, *cases[0]).index.shape))
+    print(f"sensitivity ({shape}) : {matrix_ms:8.3f} ms / assessment")
+    print(f"one rescore per change: {loop_ms:8.3f} ms / assessment")
+    print(f"speed-up              : {loop_ms / matrix_ms:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""Equivalence harness: exact integer rounding vs the Decimal-of-float path.
+
+Enumerates random answer and movement combinations (plus edge cases: no
+traffic, one-sided traffic, very large counts) and compares, per aerodrome
+type,
+
+* ``scoring.weighted_index`` -- the exact scaled-integer path used by
+  ``score_batch`` --
+* the ``Fraction`` definition ``half_up((T_I*i + T_V*v) / (i+v) * 0.145455)``
+* and the previous ``int(Decimal(float_expr * 0.145455).quantize(...))``.
+
+The exact path must agree with the Fraction definition everywhere; every
+disagreement with the Decimal path is listed with its exact value, which
+shows whether float rounding (not the new path) was at fault.  The same is
+done for the ``0.145`` normalisation and movement-weighted raw scores of
+20260117app.py, for fractional movements with two decimals as its
+number inputs accept, and for movements too large for int64.
+
+Run from the repository root:  python benchmarks/check_rounding.py [--rows N]
+"""
+import argparse
+import os
+import sys
+import time
+from decimal import ROUND_HALF_UP, Decimal
+from fractions import Fraction
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from arai import table_cache  # noqa: E402
+from arai.scoring import (  # noqa: E402
+    NORMALISATION, NORMALISATION_RATIO, movement_weights, scale_round_half_up, weighted_index,
+)
+
+
+def decimal_half_up(x):
+    return int(Decimal(x).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+
+def fraction_half_up(x):
+    whole, rest = divmod(abs(x), 1)
+    return int((whole + (rest >= Fraction(1, 2))) * (1 if x >= 0 else -1))
+
+
+def decimal_index(v1, v2, ifr_value, vfr_value, num=NORMALISATION):
+    """The weighted index exactly as app.py computed it."""
+    total_value = ifr_value + vfr_value
+    ifr_ratio = ifr_value / total_value if total_value > 0 else 0.25
+    vfr_ratio = vfr_value / total_value if total_value > 0 else 0.75
+    return decimal_half_up(((v1 * ifr_ratio) + (v2 * vfr_ratio)) * num)
+
+
+def exact_value(v1, v2, ifr_value, vfr_value, scale=NORMALISATION_RATIO):
+    """The weighted value as a ``Fraction``, movements read as the decimals they print as."""
+    ifr_value, vfr_value = Fraction(str(ifr_value)), Fraction(str(vfr_value))
+    if ifr_value + vfr_value == 0:
+        ifr_value, vfr_value = (Fraction(int(w)) for w in movement_weights(0, 0))
+    return (v1 * ifr_value + v2 * vfr_value) / (ifr_value + vfr_value) * scale
+
+
+def movements(rng, n):
+    ifr = rng.integers(0, 50_000, n)
+    vfr = rng.integers(0, 50_000, n)
+    edge = n // 10
+    ifr[:edge // 3] = 0
+    vfr[edge // 3:2 * edge // 3] = 0
+    ifr[2 * edge // 3:edge], vfr[2 * edge // 3:edge] = 0, 0
+    # Small counts give many exact ties
+    small = slice(edge, 2 * edge)
+    ifr[small] = rng.integers(0, 8, edge)
+    vfr[small] = rng.integers(0, 8, edge)
+    big = slice(2 * edge, 2 * edge + 100)
+    ifr[big] = rng.integers(0, 10 ** 12, 100)
+    return ifr, vfr
+
+
+def fractional_movements(rng, n):
+    """Movements with two decimals, as 20260117app.py's number inputs allow."""
+    ifr = rng.integers(0, 5_000_000, n) / 100
+    vfr = rng.integers(0, 5_000_000, n) / 100
+    # Below one movement, and fractions of a few movements, give the most ties
+    small = slice(0, n // 2)
+    ifr[small] = rng.integers(0, 400, n // 2) / 100
+    vfr[small] = rng.integers(0, 400, n // 2) / 100
+    vfr[:n // 20] = 0
+    return ifr, vfr
+
+
+def huge_movements(rng, n):
+    """Movements beyond int64, one array per way they reach the scoring.
+
+    Python integers (object arrays), floats and uint64 (which numpy picks
+    for ``2**63`` and above) must all be scored exactly, never wrapped.
+    """
+    big = [int(x) << int(s) for x, s in zip(rng.integers(1, 2 ** 40, n), rng.integers(22, 60, n))]
+    small = rng.integers(0, 50_000, n)
+    return {
+        "Python integers": (np.array(big, dtype=object), small),
+        "floats": (np.array(big, dtype=np.float64), small),
+        "uint64": (rng.integers(2 ** 63, 2 ** 64 - 1, n, dtype=np.uint64, endpoint=True), small),
+        "uint64, VFR side": (small.astype(np.uint64), rng.integers(2 ** 63, 2 ** 64 - 1, n, dtype=np.uint64)),
+    }
+
+
+def compare(ifr_totals, vfr_totals, ifr, vfr, scale):
+    """Check ``weighted_index`` against both references; returns ``(checked, exact_ok, mismatches)``."""
+    index = weighted_index(ifr_totals, vfr_totals, ifr[:, None], vfr[:, None], scale=scale)
+    exact_ok, mismatches = True, []
+    # Python numbers (int for object and uint64 arrays, float for floats)
+    ifr_list, vfr_list = ifr.tolist(), vfr.tolist()
+    for r in range(len(index)):
+        for k in range(4):
+            args_ = (int(ifr_totals[r, k]), int(vfr_totals[r, k]), ifr_list[r], vfr_list[r])
+            value = exact_value(*args_, scale=scale)
+            exact_ok &= fraction_half_up(value) == index[r, k]
+            legacy = decimal_index(*args_, num=float(scale))
+            if legacy != index[r, k]:
+                mismatches.append((f"T_I={args_[0]} T_V={args_[1]} IFR={args_[2]} VFR={args_[3]}: "
+                                   f"exact {value} -> {index[r, k]}, Decimal path {legacy}", value))
+    return index.size, exact_ok, mismatches
+
+
+def report(title, checked, exact_ok, mismatches, elapsed=None):
+    """``mismatches`` holds ``(description, exact value)`` pairs."""
+    print(f"\n{title}")
+    print(f"  {checked:,} values checked; exact path equals the Fraction definition: {exact_ok}")
+    if elapsed is not None:
+        print(f"  exact path {elapsed[0] * 1e3:.1f} ms vs Decimal path {elapsed[1] * 1e3:.1f} ms")
+    ties = sum(value.denominator == 2 for _, value in mismatches)
+    print(f"  Decimal path disagrees on {len(mismatches):,} values, "
+          f"{ties:,} of them exact .5 ties lost to float error")
+    for line, _ in mismatches[:8]:
+        print(f"    {line}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    model = table_cache.load_model()
+    rng = np.random.default_rng(args.seed)
+    answer_idx = rng.integers(0, len(model.answer_keys), (args.rows, len(model.questions)))
+    ifr, vfr = movements(rng, args.rows)
+
+    totals = model.values[:, model._question_range, answer_idx].sum(axis=2).T
+    ifr_totals, vfr_totals = totals[:, :4], totals[:, 4:]
+
+    # --- app.py weighted index (0.145455) ---
+    start = time.perf_counter()
+    weighted_index(ifr_totals, vfr_totals, ifr[:, None], vfr[:, None])
+    exact_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for ti, tv, i, v in zip(ifr_totals, vfr_totals, ifr, vfr):
+        [decimal_index(int(a), int(b), int(i), int(v)) for a, b in zip(ti, tv)]
+    decimal_time = time.perf_counter() - start
+    report("Weighted index (app.py, x 0.145455)",
+           *compare(ifr_totals, vfr_totals, ifr, vfr, NORMALISATION_RATIO), (exact_time, decimal_time))
+
+    # --- 20260117app.py: weighted raw score, then x 0.145 ---
+    report("Weighted raw score (20260117app.py get_raw_score)", *compare(ifr_totals, vfr_totals, ifr, vfr, 1))
+
+    # --- fractional movements (20260117app.py number inputs) ---
+    fractional_ifr, fractional_vfr = fractional_movements(rng, args.rows)
+    report("Weighted raw score, fractional movements",
+           *compare(ifr_totals, vfr_totals, fractional_ifr, fractional_vfr, 1))
+    report("Weighted index, fractional movements",
+           *compare(ifr_totals, vfr_totals, fractional_ifr, fractional_vfr, NORMALISATION_RATIO))
+
+    # --- movements too large for int64 ---
+    rows = min(args.rows, 500)
+    for kind, (huge_ifr, huge_vfr) in huge_movements(rng, rows).items():
+        report(f"Weighted index, movements beyond int64 ({kind})",
+               *compare(ifr_totals[:rows], vfr_totals[:rows], huge_ifr, huge_vfr, NORMALISATION_RATIO))
+
+    scores = np.arange(0, 5_000)
+    normalised = scale_round_half_up(scores, Fraction("0.145"))
+    exact_ok = all(fraction_half_up(int(x) * Fraction("0.145")) == n for x, n in zip(scores, normalised))
+    mismatches = [
+        (f"{x} x 0.145 = {int(x) * Fraction('0.145')} -> {n}, Decimal path {decimal_half_up(float(x) * 0.145)}",
+         int(x) * Fraction("0.145"))
+        for x, n in zip(scores, normalised) if decimal_half_up(float(x) * 0.145) != n
+    ]
+    report("Normalised score (20260117app.py normalise, x 0.145), every raw score 0..4999",
+           scores.size, exact_ok, mismatches)
+
+
+if __name__ == "__main__":
+    main()
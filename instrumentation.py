@@ -0,0 +1,89 @@
+"""Per-session rerun and CPU accounting for the Streamlit app.
+
+Every script run is bracketed by ``begin_run`` / ``end_run``.  Runs are
+attributed to the assessment currently being filled in (keyed by the
+selected aerodrome); when the key changes, the finished assessment is
+appended to ``completed`` with its rerun count and server CPU time.
+
+Fragments rerun without the main script, so they are accounted
+separately: each interaction (a full run, or a widget callback that reruns
+a set of fragments) opens an entry in ``interactions`` and every fragment
+body run inside ``fragment_run`` records its name and CPU time there.
+
+Nothing here imports Streamlit: the functions take the session state
+mapping, so benchmarks can read the same numbers through AppTest.
+"""
+import time
+from collections import deque
+from contextlib import contextmanager
+
+METRICS_KEY = "_run_metrics"
+
+# Number of recent interactions kept for the diagnostics panel
+INTERACTION_HISTORY = 20
+
+
+def _metrics(state, assessment=None):
+    metrics = state.get(METRICS_KEY)
+    if metrics is None:
+        metrics = {
+            "assessment": assessment,
+            "reruns": 0,
+            "fragment_runs": 0,
+            "cpu": 0.0,
+            "completed": [],
+            "interactions": deque(maxlen=INTERACTION_HISTORY),
+        }
+        state[METRICS_KEY] = metrics
+    return metrics
+
+
+def begin_run(state, assessment):
+    """Start timing a script run for ``assessment``; returns the metrics dict."""
+    metrics = _metrics(state, assessment)
+    if metrics["assessment"] != assessment:
+        if metrics["reruns"]:
+            metrics["completed"].append({
+                "Assessment": metrics["assessment"],
+                "Reruns": metrics["reruns"],
+                "Server CPU (ms)": round(metrics["cpu"] * 1e3, 1),
+            })
+        metrics.update(assessment=assessment, reruns=0, fragment_runs=0, cpu=0.0)
+    start_interaction(state, "app")
+    # Each session's script runs on its own thread, so thread CPU time
+    # excludes work done for other sessions.
+    metrics["started"] = time.thread_time()
+    return metrics
+
+
+def end_run(state):
+    """Charge the current run to the active assessment."""
+    metrics = state[METRICS_KEY]
+    metrics["reruns"] += 1
+    metrics["cpu"] += time.thread_time() - metrics.pop("started")
+
+
+def start_interaction(state, trigger):
+    """Open a new interaction; call from widget callbacks that rerun fragments."""
+    _metrics(state)["interactions"].append({"trigger": trigger, "fragments": []})
+
+
+@contextmanager
+def fragment_run(state, name):
+    """Record that fragment ``name`` ran in the current interaction.
+
+    CPU time of a fragment-only rerun is charged to the active assessment;
+    during a full run it is already covered by ``begin_run``/``end_run``.
+    """
+    metrics = _metrics(state)
+    if not metrics["interactions"]:
+        start_interaction(state, "app")
+    started = time.thread_time()
+    try:
+        yield
+    finally:
+        cpu = time.thread_time() - started
+        metrics["interactions"][-1]["fragments"].append((name, round(cpu * 1e3, 2)))
+        if "started" not in metrics:
+            metrics["fragment_runs"] += 1
+            metrics["cpu"] += cpu
@@ -0,0 +1,419 @@
+"""Generate the adjusted IFR/VFR score tables from the ACE workbook.
+
+This is the one generator for ``adjusted_ifr.yaml`` / ``adjusted_vfr.yaml``
+(it replaces the three "generate yaml for scores" scripts); everything the
+scripts hard-coded -- workbook, sheets, row range, outputs -- is a
+command-line argument, and the output is deterministic and byte-stable.
+
+The workbook is opened once, read-only, and every sheet the outputs need is
+streamed in that single pass; ``generate`` then builds each table from the
+in-memory rows, so regenerating both ``adjusted_ifr.yaml`` and
+``adjusted_vfr.yaml`` costs one parse of the workbook.
+
+Cell conversions:
+
+* the base sheet (``VFR`` for adjusted_vfr.yaml, ``IFR`` for
+  adjusted_ifr.yaml) holds the answer values, non-numeric cells count as 0;
+* adjustment sheets (``ATC-I`` ... ``UNICOM-V``) hold percentages, either as
+  text (``"-10%"``) or as numbers (``-0.1``); each value is the base value
+  times ``1 + percentage`` rounded to an integer;
+* value sheets (``IFR``) are copied as plain values with a 0 percentage.
+
+Each sheet's cells are classified once and then converted column-wise with
+NumPy, so building many weight sets (one per regional variant) costs a few
+array operations per sheet rather than a Python call per cell.
+
+``regenerate`` is incremental: it records a fingerprint of every sheet it
+read (with the generated tables) under ``CACHE_DIR``, and on the next run
+rebuilds only the groups whose sheet -- or base sheet -- changed, merges
+them into the previous tables and reports which groups and questions
+changed, so caches downstream can be invalidated selectively.
+
+Regenerate with::
+
+    python score_generator.py "ACE Word Pictures.xlsx"
+    python score_generator.py variant.xlsx --output out/ifr.yaml=IFR \
+        --output out/vfr.yaml=VFR --rows 2:14 --compile
+
+``--compile`` also stores the compiled tables in the app's table cache, so
+the next app start needs no YAML parse at all.  Tables are validated
+before anything is written, with or without ``--compile``.
+"""
+import argparse
+import hashlib
+import os
+import pickle
+import sys
+
+import numpy as np
+import openpyxl
+import yaml
+
+from arai import scoring
+from arai.table_cache import CACHE_DIR, TableStore, file_digest
+
+EXCEL_FILE = "ACE Word Pictures.xlsx"
+
+# Columns A:F -- the question followed by answers 1..5
+NCOLS = 6
+# First and last data row of each sheet (1-based, inclusive; row 1 is the header)
+ROWS = (2, 21)
+
+GROUP_SHEETS = ("ATC-I", "ATC-V", "AFIS-I", "AFIS-V", "UNICOM-I", "UNICOM-V", "IFR")
+VALUE_SHEETS = ("IFR", "VFR")
+
+# Output file -> base sheet its groups are adjusted from
+OUTPUTS = {
+    "adjusted_ifr.yaml": "IFR",
+    "adjusted_vfr.yaml": "VFR",
+}
+
+# Bump whenever the conversions change, so recorded fingerprints are ignored
+GENERATOR_VERSION = 1
+
+
+def read_sheets(path, names, rows=ROWS, ncols=NCOLS):
+    """Read the data rows of every sheet in ``names`` in one pass over the workbook.
+
+    Returns ``{sheet: [row, ...]}``; the header row and blank rows are
+    dropped and each row is padded to ``ncols`` cells.
+    """
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        return {name: _read_rows(workbook[name], rows, ncols) for name in dict.fromkeys(names)}
+    finally:
+        workbook.close()
+
+
+def _read_rows(worksheet, rows, ncols):
+    first, last = rows
+    return [
+        tuple(row) + (None,) * (ncols - len(row))
+        for row in worksheet.iter_rows(min_row=first, max_row=last, max_col=ncols, values_only=True)
+        if any(cell is not None for cell in row)
+    ]
+
+
+def clean_question(s):
+    # An empty question cell was read by pandas as NaN
+    return ("nan" if s is None else str(s)).strip().replace("\n", " ").replace("\r", " ")
+
+
+# Cell kinds, classified once per cell before the column-wise conversions
+MISSING, NUMBER, TEXT, OTHER = 0, 1, 2, 3
+
+_KINDS = {type(None): MISSING, bool: NUMBER, int: NUMBER, float: NUMBER, str: TEXT}
+
+
+def _split(rows):
+    """Split the answer cells of ``rows`` into ``(kinds, numbers, texts)`` arrays.
+
+    ``numbers`` holds numeric cells as float64 (NaN elsewhere) and ``texts``
+    holds text cells as str (empty elsewhere).
+    """
+    cells = np.array([row[1:] for row in rows], dtype=object).reshape(len(rows), -1)
+    kinds = np.array([_KINDS.get(type(cell), OTHER) for cell in cells.flat], dtype=np.int8).reshape(cells.shape)
+    numbers = np.where(kinds == NUMBER, cells, np.nan).astype(np.float64)
+    # A NaN number is a blank cell, as pandas reads it
+    kinds[(kinds == NUMBER) & np.isnan(numbers)] = MISSING
+    is_text = kinds == TEXT
+    texts = np.where(is_text, cells, "").astype(np.str_) if is_text.any() else np.zeros(cells.shape, np.str_)
+    return kinds, numbers, texts
+
+
+def _parse(texts, mask, percent=False):
+    """Parse ``texts`` where ``mask`` is set; returns ``(values, parsed)``.
+
+    With ``percent``, ``%`` signs are dropped before parsing.
+    """
+    values = np.full(texts.shape, np.nan)
+    if not mask.any():
+        return values, mask
+    selected = texts[mask]
+    if percent:
+        selected = np.char.strip(np.char.replace(selected, "%", ""))
+    try:
+        values[mask] = selected.astype(np.float64)
+        return values, mask
+    except ValueError:
+        # Some cell is not a number: parse one by one to find out which
+        parsed = np.zeros(selected.shape, dtype=bool)
+        numbers = np.full(selected.shape, np.nan)
+        for i, text in enumerate(selected.tolist()):
+            try:
+                numbers[i] = float(text)
+                parsed[i] = True
+            except ValueError:
+                pass
+        values[mask] = numbers
+        parsed_mask = np.zeros(texts.shape, dtype=bool)
+        parsed_mask[mask] = parsed
+        return values, parsed_mask
+
+
+def base_values(rows):
+    """Base sheet answer values; blanks and text that is not a number count as 0."""
+    kinds, numbers, texts = _split(rows)
+    parsed_text, parsed = _parse(texts, kinds == TEXT)
+    values = np.where(kinds == NUMBER, numbers, np.where(parsed, parsed_text, 0.0))
+    return values
+
+
+def plain_values(rows):
+    """Value sheet cells as floats (``"10%"`` reads as 10.0); blanks read as 1.0."""
+    kinds, numbers, texts = _split(rows)
+    parsed_text, parsed = _parse(texts, kinds == TEXT, percent=True)
+    val = np.where(kinds == NUMBER, numbers, parsed_text)
+    return np.where((kinds == NUMBER) | parsed, 1.0 * (val * 100) / 100.0, 1.0)
+
+
+def adjustment_factors(rows):
+    """Adjustment cells as ``(multipliers, raw percentages)`` arrays.
+
+    Text is a percentage (``"-10%"`` -> ``0.9, -10.0``); numbers are
+    fractions (``-0.1`` -> ``0.9, -10.0``); blanks and anything else read as
+    ``1.0, 0.0``.
+    """
+    kinds, numbers, texts = _split(rows)
+    parsed_text, parsed = _parse(texts, kinds == TEXT, percent=True)
+    is_number = kinds == NUMBER
+    raw = np.where(is_number, numbers * 100.0, np.where(parsed, parsed_text, 0.0))
+    mult = np.where(is_number, 1 + numbers, np.where(parsed, 1 + (parsed_text / 100.0), 1.0))
+    return mult, raw
+
+
+def round_percentage(raw):
+    """``int(round(raw, 3))`` elementwise, with Python's correctly rounded ``round``."""
+    rounded = np.round(raw, 3)
+    # np.round scales by 1000 and can land on the other side of a tie that
+    # Python's decimal-exact round() resolves; redo those few cells in Python.
+    scaled = raw * 1000.0
+    near_tie = np.abs(np.abs(scaled - np.floor(scaled)) - 0.5) < 1e-6
+    for i in zip(*np.nonzero(near_tie)):
+        rounded[i] = round(float(raw[i]), 3)
+    return np.trunc(rounded).astype(np.int64)
+
+
+def _questions(rows):
+    """``{question: row}``; a repeated question keeps its last row."""
+    return {clean_question(row[0]): r for r, row in enumerate(rows)}
+
+
+def generate(sheets, base_sheet, group_sheets=GROUP_SHEETS):
+    """Build ``{group: {question: {answer: {"value", "percentage"}}}}`` from read rows."""
+    base_rows = _questions(sheets[base_sheet])
+    base = base_values(sheets[base_sheet])
+
+    tables = {}
+    for sheet in group_sheets:
+        rows = sheets[sheet]
+        cols = range(1, len(rows[0])) if rows else ()
+        if sheet in VALUE_SHEETS:
+            questions = [clean_question(row[0]) for row in rows]
+            values = plain_values(rows).tolist()
+            percentages = [[0.0] * len(cols)] * len(rows)
+        else:
+            factor_rows = _questions(rows)
+            # Only questions present on both sheets, in base sheet order
+            questions = [q for q in base_rows if q in factor_rows]
+            mult, raw = adjustment_factors(rows)
+            pick = [factor_rows[q] for q in questions]
+            values = np.rint(base[[base_rows[q] for q in questions]] * mult[pick]).astype(np.int64).tolist()
+            percentages = round_percentage(raw[pick]).tolist()
+
+        tables[sheet] = {
+            question: {
+                col: {"value": value, "percentage": percentage}
+                for col, value, percentage in zip(cols, value_row, percentage_row)
+            }
+            for question, value_row, percentage_row in zip(questions, values, percentages)
+        }
+    return tables
+
+
+def generate_all(path, outputs=OUTPUTS, group_sheets=GROUP_SHEETS, rows=ROWS):
+    """Build every output table from a single read of the workbook at ``path``."""
+    sheets = read_sheets(path, list(outputs.values()) + list(group_sheets), rows)
+    return {output: generate(sheets, base_sheet, group_sheets) for output, base_sheet in outputs.items()}
+
+
+def write_yaml(tables, path):
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    # libyaml emits the same text as the pure-Python dumper, several times faster
+    with open(path, "w") as f:
+        yaml.dump(tables, f, sort_keys=False, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper))
+
+
+def sheet_fingerprint(rows):
+    """Digest of the cells read from one sheet."""
+    return hashlib.sha256(repr(rows).encode("utf-8")).hexdigest()
+
+
+def diff_tables(old, new):
+    """``{group: [question, ...]}`` for every question added, removed or changed."""
+    changes = {}
+    for group in dict.fromkeys(list(new) + list(old)):
+        old_group, new_group = old.get(group, {}), new.get(group, {})
+        questions = [
+            question for question in dict.fromkeys(list(new_group) + list(old_group))
+            if old_group.get(question) != new_group.get(question)
+        ]
+        if questions:
+            changes[group] = questions
+    return changes
+
+
+def _record_path(output, cache_dir):
+    key = hashlib.sha256(os.path.abspath(output).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{key}.generator.pkl")
+
+
+def _read_record(output, cache_dir):
+    try:
+        with open(_record_path(output, cache_dir), "rb") as f:
+            record = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+    if record.get("version") != GENERATOR_VERSION:
+        return None
+    return record
+
+
+def _write_record(output, cache_dir, record):
+    # Like the table cache, an unwritable record only costs a full rebuild next time
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(_record_path(output, cache_dir), "wb") as f:
+            pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+
+
+def _read_output(output):
+    if not os.path.exists(output):
+        return {}
+    with open(output, "rb") as f:
+        return yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader)) or {}
+
+
+def regenerate(path, outputs=OUTPUTS, group_sheets=GROUP_SHEETS, rows=ROWS,
+               cache_dir=CACHE_DIR, full=False, store=None):
+    """Bring every output up to date with the workbook at ``path``.
+
+    Returns ``{output: {group: [question, ...]}}`` listing what changed;
+    an output with no changes is left untouched on disk.  ``full`` ignores
+    the recorded fingerprints.  Every output is validated before it is
+    written; ``ScoreTableError`` leaves a bad table off disk.  With a
+    ``TableStore`` as ``store``, each output's compiled table is stored
+    under the digest of the written YAML.
+    """
+    group_sheets = tuple(group_sheets)
+    sheets = read_sheets(path, list(outputs.values()) + list(group_sheets), rows)
+    fingerprints = {name: sheet_fingerprint(rows) for name, rows in sheets.items()}
+
+    report = {}
+    for output, base_sheet in outputs.items():
+        record = None if full else _read_record(output, cache_dir)
+        output_digest = file_digest(output) if os.path.exists(output) else None
+        if (record and record["output_digest"] == output_digest
+                and record["base_sheet"] == base_sheet and record["group_sheets"] == group_sheets):
+            previous, old = record["fingerprints"], record["tables"]
+            base_changed = fingerprints[base_sheet] != previous[base_sheet]
+            stale = [
+                sheet for sheet in group_sheets
+                if fingerprints[sheet] != previous[sheet] or (base_changed and sheet not in VALUE_SHEETS)
+            ]
+        else:
+            # No usable record (first run, or the output was edited by hand)
+            old = _read_output(output)
+            stale = list(group_sheets)
+
+        rebuilt = generate(sheets, base_sheet, stale) if stale else {}
+        tables = {group: rebuilt[group] if group in rebuilt else old[group] for group in group_sheets}
+        report[output] = diff_tables(old, tables)
+        # Refuse to write a table the app would refuse to load
+        problems = scoring.validate_table(tables)
+        if problems:
+            raise scoring.ScoreTableError(problems, output)
+        if report[output] or output_digest is None:
+            write_yaml(tables, output)
+            output_digest = file_digest(output)
+        if store is not None:
+            try:
+                store.put(output_digest, scoring.compile_table(tables, output_digest))
+            except scoring.ScoreTableError as e:
+                raise scoring.ScoreTableError(e.problems, output) from None
+
+        _write_record(output, cache_dir, {
+            "version": GENERATOR_VERSION,
+            "base_sheet": base_sheet,
+            "group_sheets": group_sheets,
+            "fingerprints": {name: fingerprints[name] for name in (base_sheet,) + group_sheets},
+            "output_digest": output_digest,
+            "tables": tables,
+        })
+    return report
+
+
+def _output_arg(text):
+    output, sep, base_sheet = text.rpartition("=")
+    if not sep or not output or not base_sheet:
+        raise argparse.ArgumentTypeError(f"expected FILE=SHEET, got {text!r}")
+    return output, base_sheet
+
+
+def _rows_arg(text):
+    try:
+        first, last = (int(part) for part in text.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected FIRST:LAST, got {text!r}") from None
+    if not 1 <= first <= last:
+        raise argparse.ArgumentTypeError(f"invalid row range {text!r}")
+    return first, last
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate the adjusted score tables (YAML) from an ACE workbook."
+    )
+    parser.add_argument("workbook", nargs="?", default=EXCEL_FILE,
+                        help=f"workbook to read (default: {EXCEL_FILE!r})")
+    parser.add_argument("--output", "-o", action="append", type=_output_arg, metavar="FILE=SHEET",
+                        help="write FILE from base sheet SHEET; repeatable "
+                             "(default: " + " ".join(f"{o}={b}" for o, b in OUTPUTS.items()) + ")")
+    parser.add_argument("--groups", nargs="+", default=list(GROUP_SHEETS), metavar="SHEET",
+                        help="group sheets, in output order (default: " + " ".join(GROUP_SHEETS) + ")")
+    parser.add_argument("--rows", type=_rows_arg, default=ROWS, metavar="FIRST:LAST",
+                        help="data rows of each sheet, 1-based and inclusive (default: %d:%d)" % ROWS)
+    parser.add_argument("--compile", action="store_true",
+                        help="also store the compiled tables in the app's table cache")
+    parser.add_argument("--full", action="store_true",
+                        help="rebuild every group, ignoring recorded sheet fingerprints")
+    parser.add_argument("--cache-dir", default=CACHE_DIR,
+                        help="fingerprint and compiled-table cache (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    outputs = dict(args.output) if args.output else OUTPUTS
+    store = TableStore(args.cache_dir) if args.compile else None
+    try:
+        report = regenerate(args.workbook, outputs, args.groups, args.rows,
+                            args.cache_dir, full=args.full, store=store)
+    except (OSError, KeyError, scoring.ScoreTableError) as e:
+        # openpyxl raises KeyError for a sheet the workbook does not have
+        parser.exit(1, f"{parser.prog}: error: {e}\n")
+
+    for output, changes in report.items():
+        if not changes:
+            print(f"{output}: up to date")
+            continue
+        print(f"{output}: {len(changes)} group(s) changed")
+        for group, questions in changes.items():
+            print(f"  {group}: {', '.join(questions)}")
+    if store is not None:
+        for output in outputs:
+            print(f"{output}: compiled to {store.artifact_path('table', file_digest(output))}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())